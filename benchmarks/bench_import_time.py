@@ -0,0 +1,67 @@
+"""
+Measures the time of common imports of alitra in fresh interpreters, and checks
+that scipy and dacite are only imported when rotations or config parsing are used.
+Exits with an error if an import is slower than --max-ms, so it can guard against
+regressions in CI.
+
+    python benchmarks/bench_import_time.py [--repeat 10] [--max-ms 150]
+"""
+
+import argparse
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import alitra",
+    "from alitra import Frame, Position, Positions",
+    "from alitra import Map, load_map",
+    "from alitra import Transform, TransformGraph",
+    "from alitra import Orientation; Orientation(0, 0, 0, 1, None).to_rotation()",
+    "from alitra import align_positions",
+]
+
+CODE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(seconds, "scipy" in sys.modules, "dacite" in sys.modules)
+"""
+
+
+def measure(statement: str, repeat: int):
+    """
+    :return: Fastest import in seconds, and whether scipy and dacite were imported
+    """
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CODE.format(statement=statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        results.append((float(output[0]), output[1] == "True", output[2] == "True"))
+    return min(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    too_slow = []
+    print(f"{'statement':<75} {'ms':>7} scipy dacite")
+    for statement in STATEMENTS:
+        seconds, scipy, dacite = measure(statement, args.repeat)
+        print(f"{statement:<75} {seconds * 1e3:>7.1f} {scipy!s:<5} {dacite}")
+        if args.max_ms is not None and seconds * 1e3 > args.max_ms:
+            too_slow.append(statement)
+
+    if too_slow:
+        sys.exit(f"Slower than {args.max_ms} ms: {too_slow}")
+
+
+if __name__ == "__main__":
+    main()
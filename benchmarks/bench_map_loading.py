@@ -0,0 +1,60 @@
+"""
+Compares the time to load a Map with Map.from_config (json and dacite) and
+Map.from_config_fast (orjson if installed, reference positions read into an array).
+
+    python benchmarks/bench_map_loading.py
+"""
+
+import json
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from alitra import Map
+
+
+def write_map_config(path: Path, n_positions: int) -> None:
+    frame = {"name": "robot"}
+    positions = np.random.default_rng(0).uniform(-1000, 1000, size=(n_positions, 3))
+    config = {
+        "name": "benchmark_map",
+        "reference_positions": {
+            "positions": [
+                {"x": x, "y": y, "z": z, "frame": frame}
+                for x, y, z in positions.tolist()
+            ],
+            "frame": frame,
+        },
+        "frame": frame,
+        "bounds": {
+            "position1": {"x": -1000, "y": -1000, "z": -1000, "frame": frame},
+            "position2": {"x": 1000, "y": 1000, "z": 1000, "frame": frame},
+        },
+    }
+    with open(path, "w") as json_file:
+        json.dump(config, json_file)
+
+
+def main() -> None:
+    print(
+        f"{'positions':>10} {'from_config':>14} {'from_config_fast':>17} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for n_positions in [10, 1000, 10000, 100000]:
+            path = Path(directory).joinpath(f"map_{n_positions}.json")
+            write_map_config(path, n_positions)
+            assert Map.from_config(path) == Map.from_config_fast(path)
+
+            number = max(1, 10000 // n_positions)
+            slow = min(timeit.repeat(lambda: Map.from_config(path), number=number))
+            fast = min(timeit.repeat(lambda: Map.from_config_fast(path), number=number))
+            print(
+                f"{n_positions:>10} {slow / number * 1e3:>11.3f} ms "
+                + f"{fast / number * 1e3:>14.3f} ms {slow / fast:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares memory per object and construction time of the slotted models with the
+same models as plain dataclasses with a per-instance __dict__.
+
+    python benchmarks/bench_model_memory.py [--objects 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from alitra import Frame, Orientation, Position
+
+
+@dataclass
+class DictFrame:
+    name: str
+
+
+@dataclass
+class DictPosition:
+    x: float
+    y: float
+    z: float
+    frame: DictFrame
+
+
+@dataclass
+class DictOrientation:
+    x: float
+    y: float
+    z: float
+    w: float
+    frame: DictFrame
+
+
+def measure(create: Callable[[int], object], n_objects: int):
+    """
+    :return: Bytes per object and seconds per object
+    """
+    start = time.perf_counter()
+    objects = [create(i) for i in range(n_objects)]
+    seconds = time.perf_counter() - start
+    del objects
+
+    tracemalloc.start()
+    objects = [create(i) for i in range(n_objects)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / n_objects, seconds / n_objects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100_000)
+    args = parser.parse_args()
+
+    frame, dict_frame = Frame("robot"), DictFrame("robot")
+    cases = [
+        (
+            "Position",
+            lambda i: DictPosition(float(i), 2.0, 3.0, dict_frame),
+            lambda i: Position(float(i), 2.0, 3.0, frame),
+        ),
+        (
+            "Orientation",
+            lambda i: DictOrientation(float(i), 0.0, 0.0, 1.0, dict_frame),
+            lambda i: Orientation(float(i), 0.0, 0.0, 1.0, frame),
+        ),
+        (
+            "Position with own Frame",
+            lambda i: DictPosition(float(i), 2.0, 3.0, DictFrame("robot")),
+            lambda i: Position(float(i), 2.0, 3.0, Frame("robot")),
+        ),
+    ]
+
+    print(f"{'model':<24} {'dict bytes':>10} {'slots bytes':>11} ", end="")
+    print(f"{'dict ns':>8} {'slots ns':>8}")
+    for name, create_dict, create_slots in cases:
+        dict_bytes, dict_seconds = measure(create_dict, args.objects)
+        slots_bytes, slots_seconds = measure(create_slots, args.objects)
+        print(
+            f"{name:<24} {dict_bytes:>10.0f} {slots_bytes:>11.0f} "
+            + f"{dict_seconds * 1e9:>8.0f} {slots_seconds * 1e9:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures how Transform.transform_array scales with the number of threads on large
+arrays of positions.
+
+    python benchmarks/bench_parallel_transform.py [--points 10000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import timeit
+
+import numpy as np
+
+from alitra import Frame, Transform, Translation
+
+
+def thread_counts(max_threads: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads:
+        counts.append(max_threads)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[10**6, 10**7])
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    robot_frame, asset_frame = Frame("robot"), Frame("asset")
+    transform = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+
+    print(f"{'points':>10} {'threads':>8} {'seconds':>10} {'points/s':>12} speedup")
+    for n_points in args.points:
+        array = np.random.default_rng(0).normal(size=(n_points, 3))
+        out = np.empty_like(array)
+        single = None
+        for n_threads in thread_counts(args.max_threads):
+            seconds = min(
+                timeit.repeat(
+                    lambda: transform.transform_array(
+                        array, robot_frame, asset_frame, out=out, n_threads=n_threads
+                    ),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            single = single or seconds
+            print(
+                f"{n_points:>10} {n_threads:>8} {seconds:>10.4f} "
+                + f"{n_points / seconds:>12.3e} {single / seconds:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Measures requests per second and latency of a TransformServer. The server runs in
+its own process and a local load generator sends requests from many concurrent
+clients, each keeping a number of requests in flight.
+
+    python benchmarks/bench_server.py [--clients 8] [--in-flight 16] [--points 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from alitra import (
+    Frame,
+    Transform,
+    TransformClient,
+    TransformGraph,
+    TransformServer,
+    Translation,
+)
+
+robot_frame = Frame("robot")
+asset_frame = Frame("asset")
+
+
+def run_server(socket_path: str, max_batch_delay: float) -> None:
+    transform = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    server = TransformServer(
+        TransformGraph([transform]), socket_path, max_batch_delay=max_batch_delay
+    )
+    asyncio.run(server.serve_forever())
+
+
+async def run_client(
+    socket_path: str, n_requests: int, in_flight: int, n_points: int
+) -> list:
+    array = np.random.default_rng(0).normal(size=(n_points, 3))
+    latencies = []
+
+    async with TransformClient(socket_path) as client:
+
+        async def worker(n: int) -> None:
+            for _ in range(n):
+                start = time.perf_counter()
+                await client.transform_array(array, robot_frame, asset_frame)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(
+            *(worker(n_requests // in_flight) for _ in range(in_flight))
+        )
+    return latencies
+
+
+def client_process(socket_path, n_requests, in_flight, n_points, queue) -> None:
+    queue.put(asyncio.run(run_client(socket_path, n_requests, in_flight, n_points)))
+
+
+def wait_for_socket(socket_path: str, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(socket_path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"The server did not create {socket_path}")
+        time.sleep(0.01)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--in-flight", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--points", type=int, default=10)
+    parser.add_argument("--max-batch-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "alitra.sock")
+        server = multiprocessing.Process(
+            target=run_server, args=(socket_path, args.max_batch_delay), daemon=True
+        )
+        server.start()
+        wait_for_socket(socket_path)
+
+        queue: multiprocessing.Queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(
+                target=client_process,
+                args=(socket_path, args.requests, args.in_flight, args.points, queue),
+            )
+            for _ in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        latencies = np.concatenate([queue.get() for _ in clients])
+        seconds = time.perf_counter() - start
+        for client in clients:
+            client.join()
+        server.terminate()
+
+    print(
+        f"{args.clients} clients x {args.in_flight} in flight, "
+        + f"{args.points} points per request"
+    )
+    print(f"{len(latencies) / seconds:12.0f} requests/s")
+    for percentile in (50, 90, 99):
+        latency = np.percentile(latencies, percentile) * 1e3
+        print(f"p{percentile}: {latency:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
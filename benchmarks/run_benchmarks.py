@@ -0,0 +1,309 @@
+"""
+Benchmark suite for the hot paths of alitra: transforming positions, orientations
+and poses, aligning positions and loading maps from config files.
+
+Every case is run for a range of sizes, from single points up to 10^7 points and
+from 3 to 10^4 reference positions for alignment and map loading. The results can
+be written to a json file, and compared to the results of an earlier run to find
+slowdowns. Everything runs locally, the inputs are generated with a fixed seed.
+
+    python benchmarks/run_benchmarks.py [--filter transform] [--max-size 100000]
+        [--output results.json] [--compare baseline.json] [--threshold 1.25]
+
+The script exits with status 1 if --compare finds a case that is more than
+--threshold times slower than in the baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import warnings
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from alitra import (
+    Frame,
+    Map,
+    Orientation,
+    Orientations,
+    Pose,
+    PoseArray,
+    Position,
+    Positions,
+    Transform,
+    Translation,
+    align_positions,
+)
+
+POINT_SIZES = [1, 100, 10**4, 10**6, 10**7]
+PAIR_SIZES = [3, 100, 10**4]
+SCHEMA_VERSION = 1
+
+ROBOT_FRAME = Frame("robot")
+ASSET_FRAME = Frame("asset")
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    number: int
+    repeat: int
+    best: float
+    median: float
+
+
+@dataclass
+class Case:
+    name: str
+    sizes: List[int]
+    setup: Callable[[int, Path], Callable[[], object]]
+
+
+def make_transform() -> Transform:
+    return Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=ROBOT_FRAME, to_=ASSET_FRAME),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=ROBOT_FRAME,
+        to_=ASSET_FRAME,
+    )
+
+
+def random_array(size: int, columns: int) -> np.ndarray:
+    return np.random.default_rng(0).uniform(-1000, 1000, size=(size, columns))
+
+
+def setup_transform_position(size: int, directory: Path) -> Callable[[], object]:
+    transform = make_transform()
+    positions: object
+    if size == 1:
+        positions = Position(x=1, y=2, z=3, frame=ROBOT_FRAME)
+    else:
+        positions = Positions.from_array(random_array(size, 3), frame=ROBOT_FRAME)
+    return lambda: transform.transform_position(
+        positions, ROBOT_FRAME, ASSET_FRAME  # type: ignore
+    )
+
+
+def setup_transform_orientation(size: int, directory: Path) -> Callable[[], object]:
+    transform = make_transform()
+    orientation = Orientation.from_euler_array(np.array([0.1, 0.2, 0.3]), ROBOT_FRAME)
+    return lambda: transform.transform_orientation(
+        orientation, ROBOT_FRAME, ASSET_FRAME
+    )
+
+
+def setup_transform_pose(size: int, directory: Path) -> Callable[[], object]:
+    transform = make_transform()
+    if size == 1:
+        pose = Pose(
+            Position(x=1, y=2, z=3, frame=ROBOT_FRAME),
+            Orientation.from_euler_array(np.array([0.1, 0.2, 0.3]), ROBOT_FRAME),
+            ROBOT_FRAME,
+        )
+        return lambda: transform.transform_pose(pose, ROBOT_FRAME, ASSET_FRAME)
+
+    poses = PoseArray.from_array(
+        random_array(size, 3), random_array(size, 4), frame=ROBOT_FRAME
+    )
+    return lambda: transform.transform_poses(poses, ROBOT_FRAME, ASSET_FRAME)
+
+
+def setup_to_euler(size: int, directory: Path) -> Callable[[], object]:
+    orientations = Orientations.from_quat_array(random_array(size, 4), ROBOT_FRAME)
+    return lambda: orientations.to_euler_array(degrees=True, wrap_angles=True)
+
+
+def setup_align_positions(size: int, directory: Path) -> Callable[[], object]:
+    transform = make_transform()
+    array = random_array(size, 3)
+    positions_from = Positions.from_array(array, frame=ROBOT_FRAME)
+    positions_to = Positions.from_array(
+        transform.transform_array(array, ROBOT_FRAME, ASSET_FRAME), frame=ASSET_FRAME
+    )
+    return lambda: align_positions(positions_from, positions_to, rot_axes="xyz")
+
+
+def write_map_config(path: Path, size: int) -> None:
+    frame = {"name": "robot"}
+    config = {
+        "name": "benchmark_map",
+        "reference_positions": {
+            "positions": [
+                {"x": x, "y": y, "z": z, "frame": frame}
+                for x, y, z in random_array(size, 3).tolist()
+            ],
+            "frame": frame,
+        },
+        "frame": frame,
+        "bounds": {
+            "position1": {"x": -1000, "y": -1000, "z": -1000, "frame": frame},
+            "position2": {"x": 1000, "y": 1000, "z": 1000, "frame": frame},
+        },
+    }
+    with open(path, "w") as json_file:
+        json.dump(config, json_file)
+
+
+def setup_map_from_config(size: int, directory: Path) -> Callable[[], object]:
+    path = directory.joinpath(f"map_{size}.json")
+    write_map_config(path, size)
+    return lambda: Map.from_config(path)
+
+
+def setup_map_from_config_fast(size: int, directory: Path) -> Callable[[], object]:
+    path = directory.joinpath(f"map_{size}.json")
+    write_map_config(path, size)
+    return lambda: Map.from_config_fast(path)
+
+
+CASES = [
+    Case("transform_position", POINT_SIZES, setup_transform_position),
+    Case("transform_orientation", [1], setup_transform_orientation),
+    Case("transform_pose", POINT_SIZES, setup_transform_pose),
+    Case("orientations_to_euler", POINT_SIZES[1:], setup_to_euler),
+    Case("align_positions", PAIR_SIZES, setup_align_positions),
+    Case("map_from_config", PAIR_SIZES, setup_map_from_config),
+    Case("map_from_config_fast", PAIR_SIZES, setup_map_from_config_fast),
+]
+
+
+def measure(function: Callable[[], object], repeat: int, min_time: float) -> Tuple:
+    """
+    :return: Number of calls per repeat, and the times of one call for each repeat
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        seconds = timer.timeit(number)
+        if seconds >= min_time:
+            break
+        number *= 10 if seconds < min_time / 10 else 2
+    times = [seconds] + timer.repeat(repeat=repeat - 1, number=number)
+    return number, [total / number for total in times]
+
+
+def run(
+    cases: List[Case], max_size: Optional[int], repeat: int, min_time: float
+) -> List[Result]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases:
+            for size in case.sizes:
+                if max_size is not None and size > max_size:
+                    continue
+                function = case.setup(size, Path(directory))
+                number, times = measure(function, repeat, min_time)
+                result = Result(
+                    name=case.name,
+                    size=size,
+                    number=number,
+                    repeat=repeat,
+                    best=min(times),
+                    median=statistics.median(times),
+                )
+                print(
+                    f"{result.name:<24} {result.size:>10} {format_time(result.best):>10}"
+                    + f" {format_time(result.median):>10}",
+                    flush=True,
+                )
+                results.append(result)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def metadata() -> Dict[str, object]:
+    import scipy
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: List[Result], baseline_path: Path, threshold: float) -> bool:
+    """
+    Prints the ratio between the best times of the results and the baseline
+    :return: True if no case is more than threshold times slower than the baseline
+    """
+    with open(baseline_path) as json_file:
+        baseline = {
+            (result["name"], result["size"]): result
+            for result in json.load(json_file)["results"]
+        }
+
+    slowdowns = []
+    print(f"\n{'case':<24} {'size':>10} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in results:
+        previous = baseline.get((result.name, result.size))
+        if previous is None:
+            continue
+        ratio = result.best / previous["best"]
+        flag = " SLOWER" if ratio > threshold else ""
+        print(
+            f"{result.name:<24} {result.size:>10} {format_time(previous['best']):>10}"
+            + f" {format_time(result.best):>10} {ratio:>6.2f}x{flag}"
+        )
+        if ratio > threshold:
+            slowdowns.append(result)
+
+    if slowdowns:
+        print(f"\n{len(slowdowns)} case(s) more than {threshold}x slower than baseline")
+    return not slowdowns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--max-size", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if args.filter in case.name]
+    print(f"{'case':<24} {'size':>10} {'best':>10} {'median':>10}")
+    with warnings.catch_warnings():
+        # Random quaternions can be close to gimbal lock
+        warnings.simplefilter("ignore", UserWarning)
+        results = run(cases, args.max_size, args.repeat, args.min_time)
+
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(
+                {
+                    "metadata": metadata(),
+                    "results": [asdict(result) for result in results],
+                },
+                json_file,
+                indent=2,
+            )
+    if args.compare is not None and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
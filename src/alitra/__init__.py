@@ -34,16 +34,95 @@ between the two frames.
 >>> transform = Transform(p_robot, p_asset, rotation_axes)
 """
 
-from alitra.alignment import align_maps, align_positions
-from alitra.models import (
-    Bounds,
-    Frame,
-    Map,
-    MapAlignment,
-    Orientation,
-    Pose,
-    Position,
-    Positions,
-    Translation,
-)
-from alitra.transform import Transform
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# The public names are imported from their modules on first access, so that
+# "import alitra" is fast and scipy and dacite are only loaded when they are used
+_LAZY_IMPORTS = {
+    "AlignmentResult": "alitra.alignment",
+    "align_map_alignments": "alitra.alignment",
+    "align_maps": "alitra.alignment",
+    "align_positions": "alitra.alignment",
+    "align_positions_ransac": "alitra.alignment",
+    "try_align_positions": "alitra.alignment",
+    "FileTransformStats": "alitra.file_transform",
+    "transform_file": "alitra.file_transform",
+    "IncrementalAligner": "alitra.incremental_alignment",
+    "MapRouter": "alitra.map_router",
+    "Bounds": "alitra.models",
+    "Frame": "alitra.models",
+    "Map": "alitra.models",
+    "MapAlignment": "alitra.models",
+    "Orientation": "alitra.models",
+    "Orientations": "alitra.models",
+    "Pose": "alitra.models",
+    "PoseArray": "alitra.models",
+    "Position": "alitra.models",
+    "Positions": "alitra.models",
+    "Translation": "alitra.models",
+    "load_map": "alitra.serialization",
+    "load_map_alignment": "alitra.serialization",
+    "load_transform": "alitra.serialization",
+    "save_map": "alitra.serialization",
+    "save_map_alignment": "alitra.serialization",
+    "save_transform": "alitra.serialization",
+    "TransformClient": "alitra.server",
+    "TransformServer": "alitra.server",
+    "stream_transform": "alitra.streaming",
+    "Transform": "alitra.transform",
+    "TransformGraph": "alitra.transform_graph",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from alitra.alignment import (
+        AlignmentResult,
+        align_map_alignments,
+        align_maps,
+        align_positions,
+        align_positions_ransac,
+        try_align_positions,
+    )
+    from alitra.file_transform import FileTransformStats, transform_file
+    from alitra.incremental_alignment import IncrementalAligner
+    from alitra.map_router import MapRouter
+    from alitra.models import (
+        Bounds,
+        Frame,
+        Map,
+        MapAlignment,
+        Orientation,
+        Orientations,
+        Pose,
+        PoseArray,
+        Position,
+        Positions,
+        Translation,
+    )
+    from alitra.serialization import (
+        load_map,
+        load_map_alignment,
+        load_transform,
+        save_map,
+        save_map_alignment,
+        save_transform,
+    )
+    from alitra.server import TransformClient, TransformServer
+    from alitra.streaming import stream_transform
+    from alitra.transform import Transform
+    from alitra.transform_graph import TransformGraph
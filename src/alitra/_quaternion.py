@@ -0,0 +1,373 @@
+"""
+Quaternion kernels on numpy arrays, with quaternions as [x,y,z,w] like scipy Rotation.
+
+Every function works on a single quaternion of shape (4,) as well as on batches of
+shape (N,4), and follows the algorithms of scipy Rotation so the results agree with
+scipy to rounding. They avoid creating a scipy Rotation object, which costs far more
+than the arithmetic for a single orientation. For the same reason normalize,
+multiply, from_euler and to_euler compute single quaternions with python floats,
+since numpy calls on arrays of four elements are dominated by overhead.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import warnings
+from typing import List, Tuple
+
+import numpy as np
+
+_AXES = {"x": 0, "y": 1, "z": 2}
+_GIMBAL_LOCK_EPS = 1e-7
+
+
+def normalize(quat: np.ndarray) -> np.ndarray:
+    """
+    :param quat: Quaternions of shape (4,) or (N,4)
+    :return: Quaternions scaled to unit norm
+    """
+    quat = np.asarray(quat, dtype=float)
+    if quat.ndim == 1:
+        return np.array(_normalize_single(quat.tolist()))
+    norm = np.sqrt(np.sum(quat * quat, axis=-1, keepdims=True))
+    if np.any(norm == 0):
+        raise ValueError("Found zero norm quaternions in quat")
+    return quat / norm
+
+
+def multiply(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Hamilton product p * q, the rotation q followed by p. Same as the quaternion of
+    Rotation.from_quat(p) * Rotation.from_quat(q) for unit quaternions.
+    :param p: Quaternions of shape (4,) or (N,4)
+    :param q: Quaternions of shape (4,) or (N,4)
+    :return: Quaternions of the products
+    """
+    p, q = np.asarray(p, dtype=float), np.asarray(q, dtype=float)
+    if p.ndim == 1 and q.ndim == 1:
+        return np.array(_multiply_single(p.tolist(), q.tolist()))
+    px, py, pz, pw = np.moveaxis(p, -1, 0)
+    qx, qy, qz, qw = np.moveaxis(q, -1, 0)
+    return np.stack(
+        [
+            pw * qx + qw * px + py * qz - pz * qy,
+            pw * qy + qw * py + pz * qx - px * qz,
+            pw * qz + qw * pz + px * qy - py * qx,
+            pw * qw - px * qx - py * qy - pz * qz,
+        ],
+        axis=-1,
+    )
+
+
+def conjugate(quat: np.ndarray) -> np.ndarray:
+    """
+    :param quat: Quaternions of shape (4,) or (N,4)
+    :return: Conjugate quaternions, which are the inverse rotations of unit quaternions
+    """
+    conjugated = np.array(quat, dtype=float)
+    conjugated[..., :3] *= -1
+    return conjugated
+
+
+def to_matrix(quat: np.ndarray) -> np.ndarray:
+    """
+    :param quat: Quaternions of shape (4,) or (N,4), normalized before conversion
+    :return: Rotation matrices of shape (3,3) or (N,3,3)
+    """
+    x, y, z, w = np.moveaxis(normalize(quat), -1, 0)
+    x2, y2, z2, w2 = x * x, y * y, z * z, w * w
+    xy, zw, xz, yw, yz, xw = x * y, z * w, x * z, y * w, y * z, x * w
+    matrix = np.stack(
+        [
+            x2 - y2 - z2 + w2,
+            2 * (xy - zw),
+            2 * (xz + yw),
+            2 * (xy + zw),
+            -x2 + y2 - z2 + w2,
+            2 * (yz - xw),
+            2 * (xz - yw),
+            2 * (yz + xw),
+            -x2 - y2 + z2 + w2,
+        ],
+        axis=-1,
+    )
+    return matrix.reshape(matrix.shape[:-1] + (3, 3))
+
+
+def from_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    :param matrix: Rotation matrices of shape (3,3) or (N,3,3)
+    :return: Unit quaternions of shape (4,) or (N,4)
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape[-2:] != (3, 3):
+        raise ValueError(f"Expected matrices of shape (3,3), got {matrix.shape[-2:]}")
+    m = matrix
+    trace = m[..., 0, 0] + m[..., 1, 1] + m[..., 2, 2]
+    candidates = np.stack(
+        [
+            np.stack(
+                [
+                    1 - trace + 2 * m[..., 0, 0],
+                    m[..., 1, 0] + m[..., 0, 1],
+                    m[..., 2, 0] + m[..., 0, 2],
+                    m[..., 2, 1] - m[..., 1, 2],
+                ],
+                axis=-1,
+            ),
+            np.stack(
+                [
+                    m[..., 1, 0] + m[..., 0, 1],
+                    1 - trace + 2 * m[..., 1, 1],
+                    m[..., 2, 1] + m[..., 1, 2],
+                    m[..., 0, 2] - m[..., 2, 0],
+                ],
+                axis=-1,
+            ),
+            np.stack(
+                [
+                    m[..., 2, 0] + m[..., 0, 2],
+                    m[..., 2, 1] + m[..., 1, 2],
+                    1 - trace + 2 * m[..., 2, 2],
+                    m[..., 1, 0] - m[..., 0, 1],
+                ],
+                axis=-1,
+            ),
+            np.stack(
+                [
+                    m[..., 2, 1] - m[..., 1, 2],
+                    m[..., 0, 2] - m[..., 2, 0],
+                    m[..., 1, 0] - m[..., 0, 1],
+                    1 + trace,
+                ],
+                axis=-1,
+            ),
+        ],
+        axis=-2,
+    )
+    # The largest of the diagonal and the trace gives the best conditioned candidate
+    choice = np.argmax(
+        np.stack([m[..., 0, 0], m[..., 1, 1], m[..., 2, 2], trace], axis=-1), axis=-1
+    )
+    quat = np.take_along_axis(candidates, choice[..., None, None], axis=-2)[..., 0, :]
+    return normalize(quat)
+
+
+def apply(quat: np.ndarray, vectors: np.ndarray, inverse: bool = False) -> np.ndarray:
+    """
+    Rotates vectors, like Rotation.from_quat(quat).apply(vectors, inverse)
+    :param quat: Quaternion of shape (4,), or quaternions of shape (N,4)
+    :param vectors: Vectors of shape (3,) or (N,3)
+    :param inverse: Set to true to apply the inverse rotation
+    :return: Rotated vectors
+    """
+    matrix = to_matrix(quat)
+    if inverse:
+        matrix = np.swapaxes(matrix, -1, -2)
+    vectors = np.asarray(vectors, dtype=float)
+    if matrix.ndim == 2:
+        return vectors @ matrix.T
+    return np.matmul(matrix, vectors[..., None])[..., 0]
+
+
+def from_euler(seq: str, angles: np.ndarray, degrees: bool = False) -> np.ndarray:
+    """
+    :param seq: Sequence of up to three axes, same as scipy rotation. Lower case for
+        extrinsic and upper case for intrinsic rotations
+    :param angles: Euler angles of shape (len(seq),) or (N,len(seq))
+    :param degrees: Set to true if the angles are in degrees
+    :return: Unit quaternions of shape (4,) or (N,4)
+    """
+    axes, intrinsic = _parse_seq(seq, max_axes=3)
+    angles = np.asarray(angles, dtype=float)
+    if angles.ndim == 0 and len(axes) == 1:
+        angles = angles.reshape(1)
+    if angles.ndim == 0 or angles.shape[-1] != len(axes):
+        raise ValueError(
+            f"Expected angles with last dimension {len(axes)} for sequence {seq}, "
+            + f"got shape {angles.shape}"
+        )
+    if degrees:
+        angles = np.deg2rad(angles)
+    if angles.ndim == 1:
+        return np.array(_from_euler_single(angles.tolist(), axes, intrinsic))
+
+    half_angles = angles / 2
+    cos, sin = np.cos(half_angles), np.sin(half_angles)
+    quat = _elementary_quat(axes[0], cos[..., 0], sin[..., 0])
+    for index in range(1, len(axes)):
+        elementary = _elementary_quat(axes[index], cos[..., index], sin[..., index])
+        if intrinsic:
+            quat = multiply(quat, elementary)
+        else:
+            quat = multiply(elementary, quat)
+    return quat
+
+
+def to_euler(quat: np.ndarray, seq: str, degrees: bool = False) -> np.ndarray:
+    """
+    Converts quaternions to Euler angles with the quaternion based method that scipy
+    uses. At gimbal lock the third angle is set to zero and a warning is given.
+    :param quat: Quaternions of shape (4,) or (N,4), normalized before conversion
+    :param seq: Sequence of three axes, same as scipy rotation
+    :param degrees: Set to true to return the angles in degrees
+    :return: Euler angles in [-pi, pi] of shape (3,) or (N,3)
+    """
+    axes, intrinsic = _parse_seq(seq, max_axes=3)
+    if len(axes) != 3:
+        raise ValueError(f"Expected 3 axes, got {seq}")
+    quat = np.asarray(quat, dtype=float)
+    if quat.ndim == 1:
+        angles = np.array(_to_euler_single(quat.tolist(), axes, intrinsic))
+        return np.rad2deg(angles) if degrees else angles
+    quat = normalize(quat)
+
+    i, j, k = axes[::-1] if intrinsic else axes
+    symmetric = i == k
+    if symmetric:
+        k = 3 - i - j
+    sign = (i - j) * (j - k) * (k - i) // 2
+
+    if symmetric:
+        a, b = quat[..., 3], quat[..., i]
+        c, d = quat[..., j], quat[..., k] * sign
+    else:
+        a, b = quat[..., 3] - quat[..., j], quat[..., i] + quat[..., k] * sign
+        c, d = quat[..., j] + quat[..., 3], quat[..., k] * sign - quat[..., i]
+
+    angles = np.zeros(quat.shape[:-1] + (3,))
+    angles[..., 1] = 2 * np.arctan2(np.hypot(c, d), np.hypot(a, b))
+    half_sum = np.arctan2(b, a)
+    half_diff = np.arctan2(d, c)
+
+    first, third = (2, 0) if intrinsic else (0, 2)
+    case_zero = np.abs(angles[..., 1]) <= _GIMBAL_LOCK_EPS
+    case_pi = np.abs(angles[..., 1] - np.pi) <= _GIMBAL_LOCK_EPS
+    regular = ~(case_zero | case_pi)
+    if not np.all(regular):
+        _warn_gimbal_lock(stacklevel=3)
+
+    angles[..., 0] = np.where(
+        case_zero, 2 * half_sum, 2 * half_diff * (1 if intrinsic else -1)
+    )
+    angles[..., first] = np.where(regular, half_sum - half_diff, angles[..., first])
+    angles[..., third] = np.where(regular, half_sum + half_diff, angles[..., third])
+    if not symmetric:
+        angles[..., third] *= sign
+        angles[..., 1] -= np.pi / 2
+
+    angles = np.where(angles < -np.pi, angles + 2 * np.pi, angles)
+    angles = np.where(angles > np.pi, angles - 2 * np.pi, angles)
+    return np.rad2deg(angles) if degrees else angles
+
+
+def _normalize_single(quat: List[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in quat))
+    if norm == 0:
+        raise ValueError("Found zero norm quaternions in quat")
+    return [value / norm for value in quat]
+
+
+def _multiply_single(p: List[float], q: List[float]) -> List[float]:
+    px, py, pz, pw = p
+    qx, qy, qz, qw = q
+    return [
+        pw * qx + qw * px + py * qz - pz * qy,
+        pw * qy + qw * py + pz * qx - px * qz,
+        pw * qz + qw * pz + px * qy - py * qx,
+        pw * qw - px * qx - py * qy - pz * qz,
+    ]
+
+
+def _from_euler_single(
+    angles: List[float], axes: List[int], intrinsic: bool
+) -> List[float]:
+    quat: List[float] = []
+    for axis, angle in zip(axes, angles):
+        elementary = [0.0, 0.0, 0.0, math.cos(angle / 2)]
+        elementary[axis] = math.sin(angle / 2)
+        if not quat:
+            quat = elementary
+        elif intrinsic:
+            quat = _multiply_single(quat, elementary)
+        else:
+            quat = _multiply_single(elementary, quat)
+    return quat
+
+
+def _to_euler_single(
+    quat: List[float], axes: List[int], intrinsic: bool
+) -> List[float]:
+    """Same as the batched to_euler, for one quaternion"""
+    quat = _normalize_single(quat)
+
+    i, j, k = axes[::-1] if intrinsic else axes
+    symmetric = i == k
+    if symmetric:
+        k = 3 - i - j
+    sign = (i - j) * (j - k) * (k - i) // 2
+
+    if symmetric:
+        a, b, c, d = quat[3], quat[i], quat[j], quat[k] * sign
+    else:
+        a, b = quat[3] - quat[j], quat[i] + quat[k] * sign
+        c, d = quat[j] + quat[3], quat[k] * sign - quat[i]
+
+    # numpy and the math module round atan2 and hypot differently in the last bit,
+    # so numpy is used here as well to give the same angles as the batched version
+    norm_cd, norm_ab = np.hypot((c, a), (d, b)).tolist()
+    middle, half_sum, half_diff = np.arctan2((norm_cd, b, d), (norm_ab, a, c)).tolist()
+    angles = [0.0, 2 * middle, 0.0]
+
+    first, third = (2, 0) if intrinsic else (0, 2)
+    if abs(angles[1]) <= _GIMBAL_LOCK_EPS:
+        angles[0] = 2 * half_sum
+        _warn_gimbal_lock()
+    elif abs(angles[1] - math.pi) <= _GIMBAL_LOCK_EPS:
+        angles[0] = 2 * half_diff * (1 if intrinsic else -1)
+        _warn_gimbal_lock()
+    else:
+        angles[first] = half_sum - half_diff
+        angles[third] = half_sum + half_diff
+    if not symmetric:
+        angles[third] *= sign
+        angles[1] -= math.pi / 2
+
+    for index, angle in enumerate(angles):
+        if angle < -math.pi:
+            angles[index] = angle + 2 * math.pi
+        elif angle > math.pi:
+            angles[index] = angle - 2 * math.pi
+    return angles
+
+
+def _warn_gimbal_lock(stacklevel: int = 4) -> None:
+    warnings.warn(
+        "Gimbal lock detected. Setting third angle to zero since it is not "
+        + "possible to uniquely determine all angles.",
+        stacklevel=stacklevel,
+    )
+
+
+def _elementary_quat(axis: int, cos: np.ndarray, sin: np.ndarray) -> np.ndarray:
+    quat = np.zeros(np.shape(cos) + (4,))
+    quat[..., 3] = cos
+    quat[..., axis] = sin
+    return quat
+
+
+def _parse_seq(seq: str, max_axes: int) -> Tuple[List[int], bool]:
+    """
+    :return: Tuple of the axis indices and true for intrinsic rotations
+    """
+    if not 1 <= len(seq) <= max_axes:
+        raise ValueError(f"Expected 1 to {max_axes} axes, got {seq}")
+    intrinsic = re.fullmatch(r"[XYZ]+", seq) is not None
+    if not intrinsic and re.fullmatch(r"[xyz]+", seq) is None:
+        raise ValueError(
+            f"Expected axes from ['x', 'y', 'z'] or ['X', 'Y', 'Z'], got {seq}"
+        )
+    if any(seq[index] == seq[index + 1] for index in range(len(seq) - 1)):
+        raise ValueError(f"Expected consecutive axes to be different, got {seq}")
+    return [_AXES[axis] for axis in seq.lower()], intrinsic
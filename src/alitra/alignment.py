@@ -1,14 +1,26 @@
-from typing import Literal, Tuple
+from __future__ import annotations
+
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Literal, Optional, Tuple, Union
 
 import numpy as np
 from numpy.linalg import norm  # type: ignore
-from scipy.spatial.transform import Rotation
 
-from .models.map import Map
+from . import metrics
+from .models.map import Map, MapAlignment
 from .models.position import Positions
 from .models.translation import Translation
 from .transform import Transform
 
+if TYPE_CHECKING:
+    from scipy.spatial.transform import Rotation
+
+_ROTATION_PLANES = {"x": (1, 2), "y": (2, 0), "z": (0, 1)}
+
 
 def align_maps(
     map_from: Map,
@@ -35,6 +47,119 @@ def align_maps(
     )
 
 
+def align_map_alignments(
+    map_alignments: Iterable[Union[MapAlignment, Path]],
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold=0.4,
+    max_workers: Optional[int] = None,
+) -> Tuple[Dict[str, Transform], Dict[str, Exception]]:
+    """
+    Uses align_maps to create the transforms of many map alignments in parallel on a
+    process pool. A failing alignment does not stop the others.
+
+    :param map_alignments: MapAlignment objects, or paths to MapAlignment json-files
+        which are loaded in the worker processes
+    :param rot_axes: Axis of rotation. For rotations in the xy plane (most common),
+        this is set to 'z'
+    :param rsmd_threshold: The root mean square distance threshold, for the coordinate
+        fitting error in matching the two coordinate systems.
+    :param max_workers: Number of processes, defaults to the number of cores. With 1
+        the alignments are made in this process.
+    :return: Tuple of a dict of the transforms and a dict of the errors of the
+        alignments that failed, both keyed by the name of the MapAlignment. Configs
+        that can not be loaded are keyed by their path. A name shared by a loaded
+        config and another map alignment gets a ValueError in the errors.
+    :raises ValueError: If two of the MapAlignment objects have the same name
+    """
+    transforms: Dict[str, Transform] = {}
+    errors: Dict[str, Exception] = {}
+    map_alignments = list(map_alignments)
+    names = [
+        map_alignment.name
+        for map_alignment in map_alignments
+        if isinstance(map_alignment, MapAlignment)
+    ]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Map alignments must have unique names, got {duplicates}")
+
+    if max_workers == 1:
+        results = [
+            _align_map_alignment(map_alignment, rot_axes, rsmd_threshold)
+            for map_alignment in map_alignments
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _align_map_alignment, map_alignment, rot_axes, rsmd_threshold
+                )
+                for map_alignment in map_alignments
+            ]
+            results = []
+            for map_alignment, future in zip(map_alignments, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append((_map_alignment_key(map_alignment), e))
+
+    # The names of the configs are only known once they are loaded
+    counts = Counter(name for name, _ in results)
+    for name, result in results:
+        if counts[name] > 1:
+            errors[name] = ValueError(f"{counts[name]} map alignments are named {name}")
+        elif isinstance(result, Transform):
+            transforms[name] = result
+        else:
+            errors[name] = result
+    return transforms, errors
+
+
+def _align_map_alignment(
+    map_alignment: Union[MapAlignment, Path],
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold: float,
+) -> Tuple[str, Union[Transform, Exception]]:
+    name = _map_alignment_key(map_alignment)
+    try:
+        if not isinstance(map_alignment, MapAlignment):
+            map_alignment = MapAlignment.from_config(map_alignment)
+            name = map_alignment.name
+        return name, align_maps(
+            map_alignment.map_from, map_alignment.map_to, rot_axes, rsmd_threshold
+        )
+    except Exception as e:
+        return name, e
+
+
+def _map_alignment_key(map_alignment: Union[MapAlignment, Path]) -> str:
+    if isinstance(map_alignment, MapAlignment):
+        return map_alignment.name
+    return str(map_alignment)
+
+
+@dataclass
+class AlignmentResult:
+    """
+    Result of try_align_positions. The residuals are the differences between the
+    transformed positions_from and positions_to, in the frame of positions_to.
+
+    The sensitivity matrix is the one of scipy Rotation.align_vectors, proportional
+    to the covariance of the rotation estimate as a rotation vector. Multiply by the
+    variance of the position measurements to get the covariance. For a single
+    rotation axis only the diagonal element of that axis is nonzero.
+    """
+
+    transform: Transform
+    residuals: np.ndarray
+    errors: np.ndarray
+    mean_error: float
+    rms_error: float
+    sensitivity: np.ndarray
+    rsmd_threshold: float
+    passed: bool
+
+
 def align_positions(
     positions_from: Positions,
     positions_to: Positions,
@@ -59,37 +184,63 @@ def align_positions(
     :param rsmd_threshold: The root mean square distance threshold, for the coordinate
         fitting error in matching the two coordinate systems.
     """
-    if len(positions_from.positions) != len(positions_to.positions):
+    result = try_align_positions(positions_from, positions_to, rot_axes, rsmd_threshold)
+    if not result.passed:
         raise ValueError(
-            f"Expected inputs 'positions_from' and 'positions_to' to have the same shapes"
-            + f" got {len(positions_from.positions)} and {len(positions_to.positions)}, respectively"
-        )
-    if len(positions_from.positions) < 2:
-        raise ValueError(
-            f" Expected at least 2 positions, got {len(positions_from.positions)}"
+            f"Mean distance error {result.mean_error:.4f} exceeds threshold "
+            + f"{rsmd_threshold}"
         )
-    if len(positions_from.positions) < 3 and rot_axes == "xyz":
+    return result.transform
+
+
+def try_align_positions(
+    positions_from: Positions,
+    positions_to: Positions,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold=0.4,
+) -> AlignmentResult:
+    """
+    Same as align_positions, but returns the fitting errors instead of raising when
+    they exceed the threshold, so the alignment can be gated or logged by the caller.
+    Invalid positions still raise a ValueError.
+    :param positions_from: Coordinates in a fixed frame
+    :param positions_to: Coordinates in a fixed frame
+    :param rot_axes: Axis of rotation. For rotations in the xy plane (most common),
+        this is set to 'z'
+    :param rsmd_threshold: The alignment passes if the mean distance between the
+        transformed positions_from and positions_to is at most this threshold
+    :return: AlignmentResult with the transform, residuals and sensitivity
+    """
+    n_positions = len(positions_from)
+    if n_positions != len(positions_to):
         raise ValueError(
-            f" Expected at least 3 positions, got {len(positions_from.positions)}"
+            f"Expected inputs 'positions_from' and 'positions_to' to have the same shapes"
+            + f" got {n_positions} and {len(positions_to)}, respectively"
         )
+    if n_positions < 2:
+        raise ValueError(f" Expected at least 2 positions, got {n_positions}")
+    if n_positions < 3 and rot_axes == "xyz":
+        raise ValueError(f" Expected at least 3 positions, got {n_positions}")
 
-    try:
-        edges_1, edges_2 = _get_edges(positions_from, positions_to, rot_axes)
-    except Exception as e:
-        raise ValueError(e)
+    start = time.perf_counter() if metrics._sinks else None
+    array_from = positions_from.to_array()
+    array_to = positions_to.to_array()
+    _check_unique_positions(array_from)
+    _check_unique_positions(array_to)
 
-    rotation, rmsd_rot, sensitivity = Rotation.align_vectors(
-        edges_2, edges_1, return_sensitivity=True
+    centroid_from = np.mean(array_from, axis=0)
+    centroid_to = np.mean(array_to, axis=0)
+    centred_from = array_from - centroid_from
+    centred_to = array_to - centroid_to
+    rotation, sensitivity = _get_rotation_and_sensitivity(
+        centred_from, centred_to, rot_axes
     )
 
     translations: Translation = Translation.from_array(
-        np.mean(
-            positions_to.to_array() - rotation.apply(positions_from.to_array()),
-            axis=0,  # type:ignore
-        ),
+        centroid_to - rotation.apply(centroid_from),
         from_=positions_from.frame,
         to_=positions_to.frame,
-    )  # type: ignore
+    )
     transform = Transform(
         from_=positions_from.frame,
         to_=positions_to.frame,
@@ -97,82 +248,338 @@ def align_positions(
         rotation=rotation,
     )
 
-    try:
-        _check_rsme_treshold(transform, positions_to, positions_from, rsmd_threshold)
-    except Exception as e:
-        raise ValueError(e)
+    # The translation maps the centroids onto each other, so the residuals follow
+    # from the centred positions without transforming the positions again
+    residuals = centred_from @ transform.matrix[:3, :3].T - centred_to
+    errors = norm(residuals, axis=1)
+    mean_error = float(np.mean(errors))
+    rms_error = float(np.sqrt(np.mean(errors**2)))
 
-    return transform
+    if start is not None:
+        metrics._record("align_positions", start, n_positions, rms_error=rms_error)
+    return AlignmentResult(
+        transform=transform,
+        residuals=residuals,
+        errors=errors,
+        mean_error=mean_error,
+        rms_error=rms_error,
+        sensitivity=sensitivity,
+        rsmd_threshold=rsmd_threshold,
+        passed=mean_error <= rsmd_threshold,
+    )
 
 
-def _get_edges(
+def align_positions_ransac(
     positions_from: Positions,
     positions_to: Positions,
     rot_axes: Literal["x", "y", "z", "xyz"],
-    tol: float = 10e-2,
-) -> Tuple[np.ndarray, np.ndarray]:
-    edges_from = _get_edges_between_coordinates(positions_from)
-    edges_to = _get_edges_between_coordinates(positions_to)
-    if np.min(norm((np.vstack([edges_from, edges_to])), axis=1)) < tol:
-        raise ValueError("Positions are not unique")
-    edges_from, edges_to = _add_dummy_rot_axis_edge(edges_from, edges_to, rot_axes)
-    return edges_from, edges_to
-
-
-def _get_edges_between_coordinates(positions_from: Positions) -> np.ndarray:
-    """Finds all edges (vectors) between the input coordinates"""
-    positions_from_arr = positions_from.to_array()
-    n_positions = positions_from_arr.shape[0]
-    edges = np.empty([sum(range(n_positions)), 3])
-    index = 0
-    for i in range(0, n_positions - 1):
-        for j in range(i + 1, n_positions):
-            edges[index, :] = np.array(
-                [
-                    positions_from_arr[i] - positions_from_arr[j],
-                ]
+    inlier_threshold: float = 0.4,
+    max_iterations: int = 1000,
+    confidence: float = 0.999,
+    batch_size: int = 256,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Tuple[Transform, np.ndarray]:
+    """
+    Robust version of align_positions for position pairs that contain outliers,
+    for example a wrongly surveyed reference point.
+
+    Minimal subsets of the position pairs (2 for a single rotation axis, 3 for
+    'xyz') are sampled at random. A transform is fitted to each subset, and the
+    transforms are scored in vectorized batches by the distance between the
+    transformed positions_from and positions_to (MSAC). The best transform is
+    refitted to all of its inliers.
+    :param positions_from: Coordinates in a fixed frame
+    :param positions_to: Coordinates in a fixed frame
+    :param rot_axes: Axis of rotation. For rotations in the xy plane (most common),
+        this is set to 'z'
+    :param inlier_threshold: Largest distance between a transformed position and
+        its pair for the pair to count as an inlier.
+    :param max_iterations: Largest number of subsets to sample.
+    :param confidence: Sampling stops early when a subset of only inliers has been
+        sampled with this probability. Not used when n_workers is set.
+    :param batch_size: Number of subsets that are scored in one vectorized batch.
+    :param n_workers: Number of processes to score the batches on. By default the
+        batches are scored in this process.
+    :param seed: Seed for the random sampling of subsets.
+    :return: Tuple of the transform and a boolean inlier mask of shape (N,)
+    """
+    n_positions = len(positions_from)
+    if n_positions != len(positions_to):
+        raise ValueError(
+            f"Expected inputs 'positions_from' and 'positions_to' to have the same shapes"
+            + f" got {n_positions} and {len(positions_to)}, respectively"
+        )
+    sample_size = 3 if rot_axes == "xyz" else 2
+    if n_positions < sample_size:
+        raise ValueError(
+            f" Expected at least {sample_size} positions, got {n_positions}"
+        )
+
+    array_from = positions_from.to_array()
+    array_to = positions_to.to_array()
+    samples = _sample_subsets(
+        n_positions, sample_size, max_iterations, np.random.default_rng(seed)
+    )
+    # Bound the (batch, N, 3) residual arrays to a few million elements
+    batch_size = max(1, min(batch_size, 2**21 // n_positions))
+    batches = [
+        samples[start : start + batch_size]
+        for start in range(0, max_iterations, batch_size)
+    ]
+
+    costs = np.full(max_iterations, np.inf)
+    if n_workers is not None and n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(
+                    _score_subsets,
+                    array_from,
+                    array_to,
+                    batch,
+                    rot_axes,
+                    inlier_threshold,
+                )
+                for batch in batches
+            ]
+            for index, future in enumerate(futures):
+                start = index * batch_size
+                costs[start : start + len(batches[index])] = future.result()[1]
+    else:
+        required_iterations = max_iterations
+        best_inliers = 0
+        for index, batch in enumerate(batches):
+            start = index * batch_size
+            if start >= required_iterations:
+                break
+            n_inliers, costs[start : start + len(batch)] = _score_subsets(
+                array_from, array_to, batch, rot_axes, inlier_threshold
+            )
+            best_inliers = max(best_inliers, int(np.max(n_inliers)))
+            required_iterations = _get_required_iterations(
+                best_inliers / n_positions, sample_size, confidence, max_iterations
             )
-            index = index + 1
-    return edges
 
+    best_sample = samples[np.argmin(costs)]
+    rotation_matrix, translation = _fit_subsets(
+        array_from[best_sample][None], array_to[best_sample][None], rot_axes
+    )
+    inliers = _get_inliers(
+        array_from, array_to, rotation_matrix[0], translation[0], inlier_threshold
+    )
+    if np.count_nonzero(inliers) < sample_size:
+        raise ValueError(
+            f"Found {np.count_nonzero(inliers)} inliers, expected at least {sample_size}"
+        )
+
+    centroid_from = np.mean(array_from[inliers], axis=0)
+    centroid_to = np.mean(array_to[inliers], axis=0)
+    rotation = _get_rotation(
+        array_from[inliers] - centroid_from, array_to[inliers] - centroid_to, rot_axes
+    )
+    transform = Transform(
+        from_=positions_from.frame,
+        to_=positions_to.frame,
+        translation=Translation.from_array(
+            centroid_to - rotation.apply(centroid_from),
+            from_=positions_from.frame,
+            to_=positions_to.frame,
+        ),
+        rotation=rotation,
+    )
+    inliers = _get_inliers(
+        array_from,
+        array_to,
+        transform.matrix[:3, :3],
+        transform.matrix[:3, 3],
+        inlier_threshold,
+    )
+    return transform, inliers
+
+
+def _sample_subsets(
+    n_positions: int, sample_size: int, n_samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draws n_samples subsets of sample_size distinct indices"""
+    samples = rng.integers(n_positions, size=(n_samples, sample_size))
+    repeated = _has_repeated_index(samples)
+    while np.any(repeated):
+        samples[repeated] = rng.integers(
+            n_positions, size=(np.count_nonzero(repeated), sample_size)
+        )
+        repeated = _has_repeated_index(samples)
+    return samples
 
-def _add_dummy_rot_axis_edge(
-    edges_from: np.ndarray,
-    edges_to: np.ndarray,
+
+def _has_repeated_index(samples: np.ndarray) -> np.ndarray:
+    sorted_samples = np.sort(samples, axis=1)
+    return np.any(sorted_samples[:, 1:] == sorted_samples[:, :-1], axis=1)
+
+
+def _get_required_iterations(
+    inlier_ratio: float, sample_size: int, confidence: float, max_iterations: int
+) -> int:
+    """Number of subsets needed to sample one with only inliers with confidence"""
+    p_all_inliers = inlier_ratio**sample_size
+    if p_all_inliers >= 1:
+        return 0
+    if p_all_inliers <= 0:
+        return max_iterations
+    return min(
+        max_iterations, int(np.ceil(np.log(1 - confidence) / np.log(1 - p_all_inliers)))
+    )
+
+
+def _score_subsets(
+    array_from: np.ndarray,
+    array_to: np.ndarray,
+    samples: np.ndarray,
     rot_axes: Literal["x", "y", "z", "xyz"],
+    inlier_threshold: float,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    """Adds vectors to help ensure no rotations about non specified axes"""
-    if rot_axes == "z":
-        edges_from[:, 2] = 0
-        edges_to[:, 2] = 0
-        edges_from = np.vstack([edges_from, np.array([[0, 0, 1]])])
-        edges_to = np.vstack([edges_to, np.array([[0, 0, 1]])])
-    if rot_axes == "y":
-        edges_from[:, 1] = 0
-        edges_to[:, 1] = 0
-        edges_from = np.vstack([edges_from, np.array([[0, 1, 0]])])
-        edges_to = np.vstack([edges_to, np.array([[0, 1, 0]])])
-    if rot_axes == "x":
-        edges_from[:, 0] = 0
-        edges_to[:, 0] = 0
-        edges_from = np.vstack([edges_from, np.array([[1, 0, 0]])])
-        edges_to = np.vstack([edges_to, np.array([[1, 0, 0]])])
-    return edges_from, edges_to
-
-
-def _check_rsme_treshold(
-    transform: Transform,
-    positions_to: Positions,
-    positions_from: Positions,
-    rsmd_threshold: float,
-) -> float:
-    positions_to_new = transform.transform_position(
-        positions_to, from_=positions_to.frame, to_=positions_from.frame
+    """
+    Fits a transform to each subset and scores it on all positions.
+    :return: Tuple of the number of inliers and the MSAC cost of each subset
+    """
+    rotation_matrices, translations = _fit_subsets(
+        array_from[samples], array_to[samples], rot_axes
     )
-    transform_distance_error = positions_from.to_array() - positions_to_new.to_array()
-    rsm_distance = np.mean(norm(transform_distance_error, axis=1))
-    if rsm_distance > rsmd_threshold:
-        raise ValueError(
-            f"Root mean square error {rsm_distance:.4f} exceeds treshold {rsmd_threshold}"
+    predicted = np.matmul(array_from, rotation_matrices.transpose(0, 2, 1))
+    predicted += translations[:, None, :]
+    predicted -= array_to
+    errors = norm(predicted, axis=2)
+    inliers = errors < inlier_threshold
+    costs = np.sum(np.where(inliers, errors, inlier_threshold), axis=1)
+    return np.count_nonzero(inliers, axis=1), costs
+
+
+def _fit_subsets(
+    subsets_from: np.ndarray,
+    subsets_to: np.ndarray,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized fit of a transform to each of a batch of subsets of shape (B,k,3).
+    :return: Tuple of rotation matrices (B,3,3) and translations (B,3)
+    """
+    from scipy.spatial.transform import Rotation
+
+    centroids_from = np.mean(subsets_from, axis=1)
+    centroids_to = np.mean(subsets_to, axis=1)
+    centred_from = subsets_from - centroids_from[:, None, :]
+    centred_to = subsets_to - centroids_to[:, None, :]
+
+    if rot_axes == "xyz":
+        covariance = np.matmul(centred_from.transpose(0, 2, 1), centred_to)
+        u, _, vt = np.linalg.svd(covariance)
+        v_ut = np.matmul(vt.transpose(0, 2, 1), u.transpose(0, 2, 1))
+        reflection = np.ones((len(subsets_from), 3))
+        reflection[:, 2] = np.where(np.linalg.det(v_ut) < 0, -1, 1)
+        rotation_matrices = np.matmul(
+            vt.transpose(0, 2, 1) * reflection[:, None, :], u.transpose(0, 2, 1)
+        )
+    else:
+        i, j = _ROTATION_PLANES[rot_axes]
+        sin = np.sum(
+            centred_from[:, :, i] * centred_to[:, :, j]
+            - centred_from[:, :, j] * centred_to[:, :, i],
+            axis=1,
+        )
+        cos = np.sum(
+            centred_from[:, :, i] * centred_to[:, :, i]
+            + centred_from[:, :, j] * centred_to[:, :, j],
+            axis=1,
+        )
+        rotation_matrices = Rotation.from_euler(
+            rot_axes, np.arctan2(sin, cos)[:, None]
+        ).as_matrix()
+
+    translations = centroids_to - np.matmul(
+        rotation_matrices, centroids_from[:, :, None]
+    ).reshape(-1, 3)
+    return rotation_matrices, translations
+
+
+def _get_inliers(
+    array_from: np.ndarray,
+    array_to: np.ndarray,
+    rotation_matrix: np.ndarray,
+    translation: np.ndarray,
+    inlier_threshold: float,
+) -> np.ndarray:
+    errors = norm(array_from @ rotation_matrix.T + translation - array_to, axis=1)
+    return errors < inlier_threshold
+
+
+def _get_rotation(
+    centred_from: np.ndarray,
+    centred_to: np.ndarray,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+) -> Rotation:
+    """
+    Finds the rotation that best aligns the centred positions centred_from with
+    centred_to (Kabsch). The cost is linear in the number of positions.
+    """
+    from scipy.spatial.transform import Rotation
+
+    if rot_axes == "xyz":
+        rotation, _ = Rotation.align_vectors(centred_to, centred_from)
+        return rotation
+    return _get_axis_rotation(centred_from, centred_to, rot_axes)
+
+
+def _get_rotation_and_sensitivity(
+    centred_from: np.ndarray,
+    centred_to: np.ndarray,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+) -> Tuple[Rotation, np.ndarray]:
+    """
+    Same as _get_rotation, and also returns the sensitivity matrix of the rotation.
+    For a single axis this is the inverse of the sum of squared distances to the
+    axis, which is what align_vectors gives when the other axes are held fixed.
+    """
+    from scipy.spatial.transform import Rotation
+
+    if rot_axes == "xyz":
+        rotation, _, sensitivity = Rotation.align_vectors(
+            centred_to, centred_from, return_sensitivity=True
         )
-    return rsmd_threshold
+        return rotation, sensitivity
+
+    i, j = _ROTATION_PLANES[rot_axes]
+    sensitivity = np.zeros((3, 3))
+    with np.errstate(divide="ignore"):
+        sensitivity[3 - i - j, 3 - i - j] = 1 / np.sum(
+            centred_from[:, i] ** 2 + centred_from[:, j] ** 2
+        )
+    return _get_axis_rotation(centred_from, centred_to, rot_axes), sensitivity
+
+
+def _get_axis_rotation(
+    centred_from: np.ndarray,
+    centred_to: np.ndarray,
+    rot_axis: Literal["x", "y", "z"],
+) -> Rotation:
+    """
+    Closed form solution for the rotation about a single axis that best aligns the
+    centred coordinates in the plane normal to that axis
+    """
+    from scipy.spatial.transform import Rotation
+
+    i, j = _ROTATION_PLANES[rot_axis]
+    sin = np.sum(centred_from[:, i] * centred_to[:, j]) - np.sum(
+        centred_from[:, j] * centred_to[:, i]
+    )
+    cos = np.sum(centred_from[:, i] * centred_to[:, i]) + np.sum(
+        centred_from[:, j] * centred_to[:, j]
+    )
+    return Rotation.from_euler(rot_axis, np.arctan2(sin, cos))
+
+
+def _check_unique_positions(positions: np.ndarray, tol: float = 10e-2) -> None:
+    """Uses a k-d tree to check that no two positions are closer than tol"""
+    from scipy.spatial import cKDTree
+
+    distances, _ = cKDTree(positions).query(positions, k=2)
+    if np.min(distances[:, 1]) < tol:
+        raise ValueError("Positions are not unique")
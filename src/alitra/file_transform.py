@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from .models.frame import Frame
+from .transform import Transform
+
+
+@dataclass
+class FileTransformStats:
+    """
+    Throughput of a file transform
+    """
+
+    n_points: int
+    n_chunks: int
+    n_bytes: int
+    seconds: float
+
+    @property
+    def points_per_second(self) -> float:
+        return self.n_points / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """
+        :return: Bytes read and written per second, in megabytes
+        """
+        return self.n_bytes / 1e6 / self.seconds if self.seconds > 0 else float("inf")
+
+    def __str__(self):
+        return (
+            f"{self.n_points} points in {self.n_chunks} chunks, {self.seconds:.3f} s, "
+            + f"{self.points_per_second:.3e} points/s, "
+            + f"{self.megabytes_per_second:.1f} MB/s"
+        )
+
+
+def transform_file(
+    transform: Transform,
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    from_: Frame,
+    to_: Frame,
+    chunk_size: int = 1_000_000,
+    dtype: Optional[np.dtype] = None,
+) -> FileTransformStats:
+    """
+    Transforms the positions in a .npy-file from from_ to to_ and writes them to
+    another .npy-file. Both files are memory-mapped and the positions are transformed
+    in chunks, so the memory use is bounded by the chunk size and not the file size.
+    :param transform: Transform between from_ and to_
+    :param input_path: Path of a .npy-file with positions of shape (N,3) in from_
+    :param output_path: Path of the .npy-file to write the positions in to_ to, must
+        not be the input file
+    :param from_: Source Frame
+    :param to_: Destination Frame
+    :param chunk_size: Number of positions to transform at a time
+    :param dtype: Data type of the output, defaults to the input data type for
+        floating point input and float64 otherwise
+    :return: Statistics of the throughput
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if Path(input_path).resolve() == Path(output_path).resolve():
+        # Opening the output would truncate the memory-mapped input
+        raise ValueError(f"The output path must differ from the input {input_path}")
+
+    start = time.perf_counter()
+    positions = np.load(input_path, mmap_mode="r")
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError(f"Expected positions of shape (N,3), got {positions.shape}")
+    if dtype is None:
+        dtype = positions.dtype if positions.dtype.kind == "f" else np.dtype(float)
+
+    output = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=dtype, shape=positions.shape
+    )
+    n_points = positions.shape[0]
+    n_chunks = 0
+    for chunk_start in range(0, n_points, chunk_size):
+        chunk = slice(chunk_start, min(chunk_start + chunk_size, n_points))
+        output[chunk] = transform.transform_array(positions[chunk], from_, to_)
+        n_chunks += 1
+    output.flush()
+    del output
+
+    return FileTransformStats(
+        n_points=n_points,
+        n_chunks=n_chunks,
+        n_bytes=n_points * 3 * (positions.dtype.itemsize + np.dtype(dtype).itemsize),
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import Literal, Optional
+
+import numpy as np
+
+from .alignment import _ROTATION_PLANES
+from .models.frame import Frame
+from .models.position import Position
+from .models.translation import Translation
+from .transform import Transform
+
+
+class IncrementalAligner:
+    """
+    Aligns two coordinate frames from position pairs that are added or removed one at
+    a time, for example while reference points are surveyed during commissioning.
+
+    Only the number of pairs, the sums of the positions and their cross-covariance
+    are kept, so adding or removing a pair and updating the transform and the root
+    mean square error costs the same regardless of the number of pairs. The transform
+    is the same as the one align_positions finds from all pairs, but no threshold is
+    checked.
+    """
+
+    _offset_from: Optional[np.ndarray]
+    _offset_to: Optional[np.ndarray]
+    _transform: Optional[Transform]
+
+    def __init__(
+        self,
+        from_: Frame,
+        to_: Frame,
+        rot_axes: Literal["x", "y", "z", "xyz"],
+    ) -> None:
+        """
+        :param from_: Frame of the positions the transform is coming from
+        :param to_: Frame of the positions the transform is going to
+        :param rot_axes: Axis of rotation. For rotations in the xy plane (most common),
+            this is set to 'z'
+        """
+        self.from_ = from_
+        self.to_ = to_
+        self.rot_axes = rot_axes
+        self._reset()
+
+    @property
+    def n_positions(self) -> int:
+        """
+        :return: Number of position pairs in the alignment
+        """
+        return self._n_positions
+
+    def add(self, position_from: Position, position_to: Position) -> None:
+        """
+        Adds a position pair to the alignment
+        :param position_from: Position in the from_ frame
+        :param position_to: The same position in the to_ frame
+        """
+        self._update(position_from, position_to, 1)
+
+    def remove(self, position_from: Position, position_to: Position) -> None:
+        """
+        Removes a position pair that was previously added to the alignment
+        :param position_from: Position in the from_ frame
+        :param position_to: The same position in the to_ frame
+        """
+        if self._n_positions == 0:
+            raise ValueError("There are no positions to remove")
+        self._update(position_from, position_to, -1)
+        if self._n_positions == 0:
+            self._reset()
+
+    @property
+    def transform(self) -> Transform:
+        """
+        :return: Transform that best aligns the positions added so far
+        """
+        if self._transform is None:
+            self._transform = self._get_transform()
+        return self._transform
+
+    @property
+    def rms_error(self) -> float:
+        """
+        :return: Root mean square distance between the positions in the to_ frame and
+            the transformed positions from the from_ frame
+        """
+        rotation_matrix = self.transform.matrix[:3, :3]
+        n = self._n_positions
+        squared_error = (
+            self._sum_squares
+            - (self._sum_from @ self._sum_from + self._sum_to @ self._sum_to) / n
+            - 2 * np.trace(rotation_matrix @ self._get_covariance())
+        )
+        return float(np.sqrt(max(squared_error, 0) / n))
+
+    def _reset(self) -> None:
+        self._n_positions = 0
+        # Positions are stored relative to the first pair to limit round-off errors
+        self._offset_from = None
+        self._offset_to = None
+        self._sum_from = np.zeros(3)
+        self._sum_to = np.zeros(3)
+        self._sum_cross = np.zeros((3, 3))
+        self._sum_squares = 0.0
+        self._transform = None
+
+    def _update(self, position_from: Position, position_to: Position, sign: int):
+        if position_from.frame != self.from_ or position_to.frame != self.to_:
+            raise ValueError(
+                f"Expected positions in frames {self.from_} and {self.to_}, got "
+                + f"{position_from.frame} and {position_to.frame}"
+            )
+        if self._offset_from is None or self._offset_to is None:
+            self._offset_from = position_from.to_array()
+            self._offset_to = position_to.to_array()
+
+        array_from = position_from.to_array() - self._offset_from
+        array_to = position_to.to_array() - self._offset_to
+        self._n_positions += sign
+        self._sum_from += sign * array_from
+        self._sum_to += sign * array_to
+        self._sum_cross += sign * np.outer(array_from, array_to)
+        self._sum_squares += sign * (array_from @ array_from + array_to @ array_to)
+        self._transform = None
+
+    def _get_covariance(self) -> np.ndarray:
+        """Cross-covariance of the centred positions, sum of from * to^T"""
+        return (
+            self._sum_cross - np.outer(self._sum_from, self._sum_to) / self._n_positions
+        )
+
+    def _get_transform(self) -> Transform:
+        from scipy.spatial.transform import Rotation
+
+        min_positions = 3 if self.rot_axes == "xyz" else 2
+        if self._n_positions < min_positions:
+            raise ValueError(
+                f" Expected at least {min_positions} positions, got {self._n_positions}"
+            )
+
+        covariance = self._get_covariance()
+        if self.rot_axes == "xyz":
+            u, _, vt = np.linalg.svd(covariance)
+            reflection = np.diag([1, 1, np.sign(np.linalg.det(vt.T @ u.T)) or 1])
+            rotation = Rotation.from_matrix(vt.T @ reflection @ u.T)
+        else:
+            i, j = _ROTATION_PLANES[self.rot_axes]
+            rotation = Rotation.from_euler(
+                self.rot_axes,
+                np.arctan2(
+                    covariance[i, j] - covariance[j, i],
+                    covariance[i, i] + covariance[j, j],
+                ),
+            )
+
+        centroid_from = self._sum_from / self._n_positions + self._offset_from
+        centroid_to = self._sum_to / self._n_positions + self._offset_to
+        return Transform(
+            translation=Translation.from_array(
+                centroid_to - rotation.apply(centroid_from),
+                from_=self.from_,
+                to_=self.to_,
+            ),
+            from_=self.from_,
+            to_=self.to_,
+            rotation=rotation,
+        )
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .models.frame import Frame
+from .models.map import Map
+from .models.position import Positions, _positions_to_array
+from .transform import Transform
+
+
+class MapRouter:
+    """
+    Finds which of many maps a batch of positions is in, and transforms the positions
+    with the transform of that map.
+
+    The bounds of the maps are indexed with a uniform grid in the xy-plane. Each grid
+    cell lists the maps whose bounds overlap it, so each position is only checked
+    against the few maps near it. Where bounds overlap, the first map in the list is
+    used. All bounds must be in the same frame as the positions that are routed.
+    """
+
+    def __init__(
+        self,
+        maps: List[Map],
+        transforms: List[Transform],
+        cell_size: Optional[float] = None,
+    ) -> None:
+        """
+        :param maps: Maps with bounds and unique names, all bounds in the same frame
+        :param transforms: Transform of each map, from the frame of the bounds to the
+            frame the positions in that map should be transformed to
+        :param cell_size: Side length of the grid cells. By default the grid has about
+            four cells per map.
+        """
+        if len(maps) == 0 or len(maps) != len(transforms):
+            raise ValueError("Expected one transform for each of at least one map")
+        if any(map.bounds is None for map in maps):
+            raise ValueError("All maps must have bounds")
+        names = [map.name for map in maps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"All maps must have unique names, got {names}")
+        self.frame: Frame = maps[0].bounds.frame
+        if any(map.bounds.frame != self.frame for map in maps):
+            raise ValueError(f"The bounds of all maps must be in frame {self.frame}")
+
+        self.maps = maps
+        self.transforms = transforms
+        self._destinations: List[Frame] = []
+        for transform in transforms:
+            if transform.from_ == self.frame:
+                self._destinations.append(transform.to_)
+            elif transform.to_ == self.frame:
+                self._destinations.append(transform.from_)
+            else:
+                raise ValueError(
+                    f"Transform between {transform.from_} and {transform.to_} does "
+                    + f"not start in frame {self.frame}"
+                )
+
+        self._lower = np.array(
+            [[map.bounds.x_min, map.bounds.y_min, map.bounds.z_min] for map in maps]
+        )
+        self._upper = np.array(
+            [[map.bounds.x_max, map.bounds.y_max, map.bounds.z_max] for map in maps]
+        )
+        self._build_grid(cell_size)
+
+    def _build_grid(self, cell_size: Optional[float]) -> None:
+        self._origin = np.min(self._lower[:, :2], axis=0)
+        extent = np.max(self._upper[:, :2], axis=0) - self._origin
+        if cell_size is None:
+            cell_size = float(np.max(extent)) / np.ceil(2 * np.sqrt(len(self.maps)))
+        self._cell_size = cell_size if cell_size > 0 else 1.0
+        self._grid_shape = np.maximum(np.ceil(extent / self._cell_size).astype(int), 1)
+
+        first_cells = self._to_cells(self._lower[:, :2])
+        last_cells = self._to_cells(self._upper[:, :2])
+        cell_maps: List[List[int]] = [[] for _ in range(np.prod(self._grid_shape))]
+        for index, (first, last) in enumerate(zip(first_cells, last_cells)):
+            for cell_x in range(first[0], last[0] + 1):
+                for cell_y in range(first[1], last[1] + 1):
+                    cell_maps[cell_x * self._grid_shape[1] + cell_y].append(index)
+
+        self._cell_maps = np.full(
+            (len(cell_maps), max(len(maps) for maps in cell_maps)), -1, dtype=int
+        )
+        for cell, maps in enumerate(cell_maps):
+            self._cell_maps[cell, : len(maps)] = maps
+
+    def _to_cells(self, xy: np.ndarray) -> np.ndarray:
+        cells = np.floor((xy - self._origin) / self._cell_size).astype(int)
+        return np.clip(cells, 0, self._grid_shape - 1)
+
+    def route(self, positions: Union[Positions, np.ndarray]) -> np.ndarray:
+        """
+        Finds the map containing each position.
+        :param positions: Positions, or a numpy array of shape (N,3) which is assumed
+            to be in the frame of the bounds.
+        :return: Numpy array of shape (N,) with the index of the map containing each
+            position, or -1 for positions outside all maps
+        """
+        array = _positions_to_array(positions, self.frame)
+        cells = self._to_cells(array[:, :2])
+        cell_maps = self._cell_maps[cells[:, 0] * self._grid_shape[1] + cells[:, 1]]
+
+        routes = np.full(array.shape[0], -1, dtype=int)
+        for candidates in cell_maps.T:
+            unrouted = np.flatnonzero((routes == -1) & (candidates >= 0))
+            if unrouted.size == 0:
+                continue
+            candidates = candidates[unrouted]
+            within = np.all(
+                (array[unrouted] >= self._lower[candidates])
+                & (array[unrouted] <= self._upper[candidates]),
+                axis=1,
+            )
+            routes[unrouted[within]] = candidates[within]
+        return routes
+
+    def transform_positions(
+        self, positions: Union[Positions, np.ndarray]
+    ) -> Dict[str, Positions]:
+        """
+        Transforms each position with the transform of the map containing it. The
+        positions of each map are transformed together in one vectorized call.
+        Positions outside all maps are left out.
+        :param positions: Positions, or a numpy array of shape (N,3) which is assumed
+            to be in the frame of the bounds.
+        :return: Dict from map name to the transformed positions in that map, in the
+            order they were given. Use route to find their original indices.
+        """
+        array = _positions_to_array(positions, self.frame)
+        routes = self.route(array)
+        transformed: Dict[str, Positions] = {}
+        for index in np.unique(routes[routes >= 0]):
+            map, transform = self.maps[index], self.transforms[index]
+            destination = self._destinations[index]
+            transformed[map.name] = Positions.from_array(
+                transform.transform_array(
+                    array[routes == index], from_=self.frame, to_=destination
+                ),
+                frame=destination,
+            )
+        return transformed
@@ -0,0 +1,154 @@
+"""
+Opt-in metrics for the hot paths of alitra.
+
+Nothing is measured until a sink is added. A sink is any callable taking a
+Measurement, for example a function forwarding to a metrics system, or a
+MetricsRegistry which aggregates the measurements in this process:
+
+>>> from alitra import metrics
+>>> registry = metrics.MetricsRegistry()
+>>> metrics.add_sink(registry)
+>>> registry.snapshot()
+{}
+>>> metrics.remove_sink(registry)
+
+While no sink is added, the instrumented functions only check whether the list of
+sinks is empty. The instrumented functions are Transform.transform_position,
+transform_orientation and transform_poses, align_positions and try_align_positions,
+and the from_config and from_config_fast methods of Map and MapAlignment. Calls with
+invalid input, and calls that return their input because the frames are equal, are
+not measured. Alignments are measured also when their error exceeds the threshold.
+
+Sinks are called in the thread that made the call, so they should be fast and must
+not raise.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, List, Optional
+
+Sink = Callable[["Measurement"], None]
+
+# Replaced instead of mutated, so the hot paths can iterate it without a lock
+_sinks: List[Sink] = []
+_sinks_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """
+    One call of an instrumented function
+    """
+
+    name: str
+    seconds: float
+    n_points: int
+    rms_error: Optional[float] = None
+
+
+@dataclass
+class OperationStats:
+    """
+    Aggregated measurements of one instrumented function
+    """
+
+    calls: int = 0
+    points: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_rms_error: Optional[float] = None
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class MetricsRegistry:
+    """
+    Sink that counts calls, points and time per instrumented function, and keeps the
+    latest alignment error
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, measurement: Measurement) -> None:
+        with self._lock:
+            stats = self._stats.get(measurement.name)
+            if stats is None:
+                stats = self._stats[measurement.name] = OperationStats()
+            stats.calls += 1
+            stats.points += measurement.n_points
+            stats.total_seconds += measurement.seconds
+            stats.max_seconds = max(stats.max_seconds, measurement.seconds)
+            if measurement.rms_error is not None:
+                stats.last_rms_error = measurement.rms_error
+
+    def snapshot(self) -> Dict[str, OperationStats]:
+        """
+        :return: Copy of the stats, keyed by the name of the instrumented function
+        """
+        with self._lock:
+            return {name: replace(stats) for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """
+        Removes all stats
+        """
+        with self._lock:
+            self._stats = {}
+
+
+def add_sink(sink: Sink) -> None:
+    """
+    :param sink: Callable which is given a Measurement for every instrumented call
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + [sink]
+
+
+def remove_sink(sink: Sink) -> None:
+    """
+    :param sink: Sink added with add_sink
+    """
+    global _sinks
+    with _sinks_lock:
+        if sink not in _sinks:
+            raise ValueError(f"{sink!r} is not a metrics sink")
+        sinks = list(_sinks)
+        sinks.remove(sink)
+        _sinks = sinks
+
+
+@contextmanager
+def collect(sink: Sink) -> Iterator[Sink]:
+    """
+    Adds the sink for the duration of the with block
+    :param sink: Callable which is given a Measurement for every instrumented call
+    :return: The sink
+    """
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+
+
+def _record(
+    name: str, start: float, n_points: int, rms_error: Optional[float] = None
+) -> None:
+    """Sends a measurement of a call started at time.perf_counter() start"""
+    measurement = Measurement(
+        name=name,
+        seconds=time.perf_counter() - start,
+        n_points=n_points,
+        rms_error=rms_error,
+    )
+    for sink in _sinks:
+        sink(measurement)
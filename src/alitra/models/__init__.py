@@ -1,7 +1,42 @@
-from .bounds import Bounds
-from .frame import Frame
-from .map import Map, MapAlignment
-from .orientation import Orientation
-from .pose import Pose
-from .position import Position, Positions
-from .translation import Translation
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Imported on first access like the names in alitra, so that using Position or
+# Frame does not import scipy through Orientation or dacite through Map
+_LAZY_IMPORTS = {
+    "Bounds": "alitra.models.bounds",
+    "Frame": "alitra.models.frame",
+    "Map": "alitra.models.map",
+    "MapAlignment": "alitra.models.map",
+    "Orientation": "alitra.models.orientation",
+    "Orientations": "alitra.models.orientation",
+    "Pose": "alitra.models.pose",
+    "PoseArray": "alitra.models.pose",
+    "Position": "alitra.models.position",
+    "Positions": "alitra.models.position",
+    "Translation": "alitra.models.translation",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from .bounds import Bounds
+    from .frame import Frame
+    from .map import Map, MapAlignment
+    from .orientation import Orientation, Orientations
+    from .pose import Pose, PoseArray
+    from .position import Position, Positions
+    from .translation import Translation
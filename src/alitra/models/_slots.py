@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError, dataclass, fields
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    overload,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import dataclass_transform
+else:
+
+    def dataclass_transform(**kwargs):
+        return lambda function: function
+
+
+T = TypeVar("T")
+
+
+@overload
+def slotted_dataclass(cls: Type[T]) -> Type[T]: ...
+
+
+@overload
+def slotted_dataclass(
+    cls: None = None,
+    *,
+    frozen: bool = False,
+    eq: bool = True,
+    extra_slots: Tuple[str, ...] = (),
+) -> Callable[[Type[T]], Type[T]]: ...
+
+
+@dataclass_transform()
+def slotted_dataclass(
+    cls: Optional[Type[T]] = None,
+    *,
+    frozen: bool = False,
+    eq: bool = True,
+    extra_slots: Tuple[str, ...] = (),
+) -> Any:
+    """
+    Creates a dataclass with __slots__ instead of a per-instance __dict__, which
+    makes the objects smaller and faster to create. Works like
+    dataclass(slots=True, frozen=frozen), which needs python 3.10.
+
+    Fields with default values are supported, since the defaults are moved into
+    __init__ before the class is recreated with slots. Frozen classes are also
+    hashable, and get __getstate__ and __setstate__ so they can be pickled.
+    :param cls: Class to create the dataclass from
+    :param frozen: Set to true to make the instances immutable
+    :param eq: Set to false to keep identity comparison and hashing
+    :param extra_slots: Names of slots for attributes that are not dataclass fields,
+        and so are left out of __init__, __repr__ and dataclasses.asdict
+    :return: The new class, or a decorator if cls is not given
+    """
+
+    def wrap(cls: Type[T]) -> Type[T]:
+        return _add_slots(dataclass(cls, frozen=frozen, eq=eq), frozen, extra_slots)
+
+    if cls is None:
+        return wrap
+    return wrap(cls)
+
+
+def _add_slots(cls: Type[T], frozen: bool, extra_slots: Tuple[str, ...]) -> Type[T]:
+    field_names = tuple(field.name for field in fields(cls))  # type: ignore
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names + extra_slots
+    for name in field_names:
+        # Class attributes holding the defaults would conflict with the slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    slotted_cls: Any = type(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+
+    if frozen:
+        # The generated __setattr__ and __delattr__ refer to the class without slots
+        slotted_cls.__setattr__ = _frozen_setattr
+        slotted_cls.__delattr__ = _frozen_delattr
+        slotted_cls.__getstate__ = _frozen_getstate
+        slotted_cls.__setstate__ = _frozen_setstate
+    return slotted_cls
+
+
+def _frozen_setattr(self, name: str, value: Any) -> None:
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self, name: str) -> None:
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _frozen_getstate(self) -> list:
+    return [getattr(self, name) for name in self.__slots__]
+
+
+def _frozen_setstate(self, state: list) -> None:
+    for name, value in zip(self.__slots__, state):
+        # The frozen __setattr__ raises, so the slots are set directly
+        object.__setattr__(self, name, value)
@@ -1,6 +1,11 @@
 from dataclasses import dataclass
+from typing import TypeVar, Union
 
-from .position import Position
+import numpy as np
+
+from .position import Position, Positions, _positions_to_array
+
+PositionsOrArray = TypeVar("PositionsOrArray", Positions, np.ndarray)
 
 
 @dataclass
@@ -25,6 +30,8 @@ class Bounds:
         self.y_min = min(position.y for position in positions)
         self.z_max = max(position.z for position in positions)
         self.z_min = min(position.z for position in positions)
+        self._lower = np.array([self.x_min, self.y_min, self.z_min], dtype=float)
+        self._upper = np.array([self.x_max, self.y_max, self.z_max], dtype=float)
 
     def position_within_bounds(self, position: Position) -> bool:
         if not position.frame == self.frame:
@@ -38,3 +45,41 @@ class Bounds:
         if position.z < self.z_min or position.z > self.z_max:
             return False
         return True
+
+    def positions_within_bounds(
+        self, positions: Union[Positions, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Checks a batch of positions against the bounds in one vectorized operation.
+        :param positions: Positions, or a numpy array of shape (N,3) which is assumed
+            to be in the frame of the bounds.
+        :return: Boolean numpy array of shape (N,), True for positions within bounds
+        """
+        array = _positions_to_array(positions, self.frame)
+        return np.all((array >= self._lower) & (array <= self._upper), axis=1)
+
+    def filter_positions(self, positions: PositionsOrArray) -> PositionsOrArray:
+        """
+        :param positions: Positions, or a numpy array of shape (N,3) which is assumed
+            to be in the frame of the bounds.
+        :return: The positions within bounds, of the same type as the input
+        """
+        array = _positions_to_array(positions, self.frame)
+        within = array[self.positions_within_bounds(array)]
+        if isinstance(positions, Positions):
+            return Positions.from_array(within, frame=self.frame)
+        return within
+
+    def clip_positions(self, positions: PositionsOrArray) -> PositionsOrArray:
+        """
+        :param positions: Positions, or a numpy array of shape (N,3) which is assumed
+            to be in the frame of the bounds.
+        :return: The positions moved to the closest point within bounds, of the same
+            type as the input
+        """
+        clipped = np.clip(
+            _positions_to_array(positions, self.frame), self._lower, self._upper
+        )
+        if isinstance(positions, Positions):
+            return Positions.from_array(clipped, frame=self.frame)
+        return clipped
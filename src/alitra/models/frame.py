@@ -1,13 +1,67 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from typing import Dict, List, Tuple
 
+from ._slots import slotted_dataclass
 
-@dataclass
+# Interned frames are never removed, so the registry grows with every distinct name.
+# Frames are meant for a bounded set of coordinate systems, not for names taken
+# from untrusted input.
+_frames: Dict[str, Frame] = {}
+_frames_by_id: List[Frame] = []
+_frames_lock = threading.Lock()
+
+
+@slotted_dataclass(frozen=True, eq=False, extra_slots=("_id",))
 class Frame:
     """
     Frame is used by most of our models to describe in which frame a model lives,
     or the two frames a transform is between.
+
+    Frames are interned, so there is one Frame object per name in a process and
+    Frame("robot") is Frame("robot"). Frames are compared and hashed by identity,
+    and each frame has a small integer id in the order the frames were created.
+    Pickled and deserialized frames resolve to the same interned objects. The id is
+    specific to the process and is not a dataclass field, so it is not serialized.
+
+    Interned frames live for the rest of the process. Create frames for a known set
+    of coordinate systems, and look up names from untrusted sources among those
+    instead of creating a Frame for each.
     """
 
     name: str
+
+    def __new__(cls, name: str) -> Frame:
+        frame = _frames.get(name)
+        if frame is not None:
+            return frame
+        with _frames_lock:
+            frame = _frames.get(name)
+            if frame is None:
+                frame = object.__new__(cls)
+                object.__setattr__(frame, "name", name)
+                object.__setattr__(frame, "_id", len(_frames_by_id))
+                _frames_by_id.append(frame)
+                _frames[name] = frame
+        return frame
+
+    @property
+    def id(self) -> int:
+        """
+        :return: Small integer id of the frame, in the order the frames were created
+        """
+        return self._id  # type: ignore
+
+    @staticmethod
+    def from_id(frame_id: int) -> Frame:
+        """
+        :param frame_id: Id of a frame created in this process
+        :return: The Frame with the given id
+        """
+        if not 0 <= frame_id < len(_frames_by_id):
+            raise ValueError(f"No frame with id {frame_id}")
+        return _frames_by_id[frame_id]
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        return Frame, (self.name,)
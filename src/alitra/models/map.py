@@ -1,14 +1,98 @@
 from __future__ import annotations
 
 import json
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from dacite import from_dict
+import numpy as np
 
+from .. import metrics
 from .bounds import Bounds
 from .frame import Frame
-from .position import Positions
+from .position import Position, Positions
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if TYPE_CHECKING:
+    from dacite import Config
+
+
+def _positions_from_dict(data: dict) -> Positions:
+    """
+    Positions is not a dataclass, so dacite is told how to build it from its fields
+    """
+    from dacite import from_dict
+
+    return Positions(
+        positions=[from_dict(data_class=Position, data=p) for p in data["positions"]],
+        frame=from_dict(data_class=Frame, data=data["frame"]),
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_dacite_config() -> Config:
+    """dacite is imported on first use, since it is only needed to load configs"""
+    from dacite import Config
+
+    return Config(type_hooks={Positions: _positions_from_dict})
+
+
+def _load_json(path: Path) -> dict:
+    """Parses a json-file with orjson if it is installed, and json otherwise"""
+    if orjson is not None:
+        with open(path, "rb") as json_file:
+            return orjson.loads(json_file.read())
+    with open(path) as json_file:
+        return json.load(json_file)
+
+
+def _frame_from_dict_fast(data: dict) -> Frame:
+    return Frame(name=data["name"])
+
+
+def _position_from_dict_fast(data: dict) -> Position:
+    return Position(
+        x=data["x"],
+        y=data["y"],
+        z=data["z"],
+        frame=_frame_from_dict_fast(data["frame"]),
+    )
+
+
+def _positions_from_dict_fast(data: dict) -> Positions:
+    """Reads the positions straight into the array of Positions"""
+    frame = _frame_from_dict_fast(data["frame"])
+    positions = data["positions"]
+    if any(position["frame"]["name"] != frame.name for position in positions):
+        raise ValueError(f"All reference positions must be in frame {frame}")
+    array = np.array(
+        [(position["x"], position["y"], position["z"]) for position in positions],
+        dtype=float,
+    ).reshape(-1, 3)
+    return Positions.from_array(array, frame=frame)
+
+
+def _map_from_dict_fast(data: dict) -> Map:
+    bounds = data.get("bounds")
+    return Map(
+        name=data["name"],
+        frame=_frame_from_dict_fast(data["frame"]),
+        reference_positions=_positions_from_dict_fast(data["reference_positions"]),
+        bounds=(
+            None
+            if bounds is None
+            else Bounds(
+                position1=_position_from_dict_fast(bounds["position1"]),
+                position2=_position_from_dict_fast(bounds["position2"]),
+            )
+        ),
+    )
 
 
 @dataclass
@@ -28,10 +112,35 @@ class Map:
         """
         Loads a Map from a json-file using dacite
         """
+        from dacite import from_dict
+
+        start = time.perf_counter() if metrics._sinks else None
         with open(map_config_path) as json_file:
             map_config_dict = json.load(json_file)
 
-        return from_dict(data_class=Map, data=map_config_dict)
+        loaded_map = from_dict(
+            data_class=Map, data=map_config_dict, config=_get_dacite_config()
+        )
+        if start is not None:
+            metrics._record(
+                "map_from_config", start, len(loaded_map.reference_positions)
+            )
+        return loaded_map
+
+    @staticmethod
+    def from_config_fast(map_config_path: Path) -> Map:
+        """
+        Loads a Map from a json-file without dacite. The reference positions are read
+        straight into an array, and orjson is used for parsing if it is installed.
+        Gives the same Map as from_config.
+        """
+        start = time.perf_counter() if metrics._sinks else None
+        loaded_map = _map_from_dict_fast(_load_json(map_config_path))
+        if start is not None:
+            metrics._record(
+                "map_from_config_fast", start, len(loaded_map.reference_positions)
+            )
+        return loaded_map
 
 
 @dataclass
@@ -49,7 +158,41 @@ class MapAlignment:
         """
         Loads a MapAlignment from a json-file using dacite
         """
+        from dacite import from_dict
+
+        start = time.perf_counter() if metrics._sinks else None
         with open(map_config_path) as json_file:
             map_config_dict = json.load(json_file)
 
-        return from_dict(data_class=MapAlignment, data=map_config_dict)
+        map_alignment = from_dict(
+            data_class=MapAlignment, data=map_config_dict, config=_get_dacite_config()
+        )
+        if start is not None:
+            metrics._record(
+                "map_alignment_from_config", start, _n_positions(map_alignment)
+            )
+        return map_alignment
+
+    @staticmethod
+    def from_config_fast(map_config_path: Path) -> MapAlignment:
+        """
+        Loads a MapAlignment from a json-file without dacite, see Map.from_config_fast
+        """
+        start = time.perf_counter() if metrics._sinks else None
+        map_config_dict = _load_json(map_config_path)
+        map_alignment = MapAlignment(
+            name=map_config_dict["name"],
+            map_from=_map_from_dict_fast(map_config_dict["map_from"]),
+            map_to=_map_from_dict_fast(map_config_dict["map_to"]),
+        )
+        if start is not None:
+            metrics._record(
+                "map_alignment_from_config_fast", start, _n_positions(map_alignment)
+            )
+        return map_alignment
+
+
+def _n_positions(map_alignment: MapAlignment) -> int:
+    return len(map_alignment.map_from.reference_positions) + len(
+        map_alignment.map_to.reference_positions
+    )
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, List
 
 import numpy as np
-from scipy.spatial.transform import Rotation
 
+from .. import _quaternion
+from ._slots import slotted_dataclass
 from .frame import Frame
 
+if TYPE_CHECKING:
+    from scipy.spatial.transform import Rotation
 
-@dataclass
+
+@slotted_dataclass
 class Orientation:
     """
     This class represents an orientation using the quaternion values:
-    x, y, z, w, and a frame. This classes uses scipy rotation to handle transformations
-    between euler and quaternions
+    x, y, z, w, and a frame. Conversions between euler angles and quaternions use the
+    quaternion kernels in alitra._quaternion, which agree with scipy rotation
     """
 
     x: float
@@ -32,14 +37,8 @@ class Orientation:
         :param seq: Sequence of axes for rotations, same as scipy rotation
         :return: Numpy array of euler angles
         """
-        rotation: Rotation = Rotation.from_quat(self.to_quat_array())
-        euler = rotation.as_euler(seq=seq, degrees=degrees)
-
-        if wrap_angles:
-            base = 360.0 if degrees else 2 * np.pi
-            euler = np.fromiter(map(lambda angle: (angle % base), euler), dtype=float)
-
-        return euler
+        euler = _quaternion.to_euler(self.to_quat_array(), seq=seq, degrees=degrees)
+        return _wrap_angles(euler, degrees) if wrap_angles else euler
 
     def to_quat_array(self) -> np.ndarray:
         """
@@ -51,6 +50,8 @@ class Orientation:
         """
         :return: Scipy Rotation object
         """
+        from scipy.spatial.transform import Rotation
+
         return Rotation.from_quat(self.to_quat_array())
 
     @staticmethod
@@ -80,8 +81,8 @@ class Orientation:
         :param seq: Sequence of axes for rotations, same as scipy rotation
         :return: Orientation object
         """
-        rotation = Rotation.from_euler(seq=seq, angles=euler, degrees=degrees)
-        return Orientation(*rotation.as_quat(), frame=frame)  # type: ignore
+        x, y, z, w = _quaternion.from_euler(seq, euler, degrees=degrees).tolist()
+        return Orientation(x=x, y=y, z=z, w=w, frame=frame)
 
     @staticmethod
     def from_rotation(rotation: Rotation, frame: Frame) -> Orientation:
@@ -107,3 +108,112 @@ class Orientation:
             + str(self.w)
             + "]"
         )
+
+
+@dataclass(eq=False)
+class Orientations:
+    """
+    Orientations contains N orientations stored as an array of quaternions [x,y,z,w]
+    with shape (N,4), and a frame in which the orientations are valid. The
+    conversions to and from euler angles are vectorized over all orientations and
+    give the same values as the conversions of a single Orientation.
+    """
+
+    quaternions: np.ndarray
+    frame: Frame
+
+    def __post_init__(self):
+        self.quaternions = np.ascontiguousarray(self.quaternions, dtype=float)
+        if self.quaternions.ndim != 2 or self.quaternions.shape[1] != 4:
+            raise ValueError("quaternions should have shape (N,4)")
+
+    def to_euler_array(
+        self, degrees: bool = False, wrap_angles: bool = False, seq: str = "ZYX"
+    ) -> np.ndarray:
+        """
+        :param degrees: Set to true to retrieve angles as degrees
+        :param wrap_angles: Set to true to get angles between 0 and 360 deg or
+            0 and two pi
+        :param seq: Sequence of axes for rotations, same as scipy rotation
+        :return: Numpy array of euler angles with shape (N,3)
+        """
+        euler = _quaternion.to_euler(self.quaternions, seq=seq, degrees=degrees)
+        return _wrap_angles(euler, degrees) if wrap_angles else euler
+
+    def to_quat_array(self) -> np.ndarray:
+        """
+        :return: Numpy array of quaternion values [x,y,z,w] with shape (N,4)
+        """
+        return self.quaternions
+
+    @staticmethod
+    def from_quat_array(quat: np.ndarray, frame: Frame) -> Orientations:
+        """
+        :param quat: Numpy array of shape (N,4) containing quaternion values, [x,y,z,w]
+        :param frame: Frame of the orientations
+        :return: Orientations object
+        """
+        return Orientations(quaternions=quat, frame=frame)
+
+    @staticmethod
+    def from_euler_array(
+        euler: np.ndarray, frame: Frame, degrees: bool = False, seq: str = "ZYX"
+    ) -> Orientations:
+        """
+        :param euler: Numpy array of euler angles of shape (N,3)
+        :param frame: Frame of the orientations
+        :param degrees: Set to true if the angles are given in degrees
+        :param seq: Sequence of axes for rotations, same as scipy rotation
+        :return: Orientations object
+        """
+        euler = np.asarray(euler, dtype=float)
+        if euler.ndim != 2 or euler.shape[1] != 3:
+            raise ValueError("euler should have shape (N,3)")
+        return Orientations(
+            quaternions=_quaternion.from_euler(seq, euler, degrees=degrees),
+            frame=frame,
+        )
+
+    def to_orientations(self) -> List[Orientation]:
+        """
+        :return: List of the orientations as Orientation objects
+        """
+        return [
+            Orientation(x=x, y=y, z=z, w=w, frame=self.frame)
+            for x, y, z, w in self.quaternions.tolist()
+        ]
+
+    @staticmethod
+    def from_orientations(
+        orientations: List[Orientation], frame: Frame
+    ) -> Orientations:
+        """
+        :param orientations: List of orientations, all in the given frame
+        :param frame: Frame of the orientations
+        :return: Orientations object
+        """
+        if any(orientation.frame != frame for orientation in orientations):
+            raise ValueError(f"All orientations must be in frame {frame}")
+        quat_array = np.array(
+            [[o.x, o.y, o.z, o.w] for o in orientations], dtype=float
+        ).reshape(-1, 4)
+        return Orientations(quat_array, frame=frame)
+
+    def __len__(self) -> int:
+        return self.quaternions.shape[0]
+
+    def __getitem__(self, index: int) -> Orientation:
+        x, y, z, w = self.quaternions[index].tolist()
+        return Orientation(x=x, y=y, z=z, w=w, frame=self.frame)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Orientations):
+            return NotImplemented
+        return self.frame == other.frame and np.array_equal(
+            self.quaternions, other.quaternions
+        )
+
+
+def _wrap_angles(euler: np.ndarray, degrees: bool) -> np.ndarray:
+    """Wraps angles to [0, 360) degrees or [0, 2 pi) radians"""
+    return np.mod(euler, 360.0 if degrees else 2 * np.pi)
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy as np
 
+from ._slots import slotted_dataclass
 from .frame import Frame
 from .orientation import Orientation
-from .position import Position
+from .position import Position, Positions
 
 
-@dataclass
+@slotted_dataclass
 class Pose:
     """
     Pose contains a position, an orientation and a frame
@@ -47,3 +48,130 @@ class Pose:
         :return: Unique string representation of the pose
         """
         return "pos:" + str(self.position) + ", ori: " + str(self.orientation)
+
+
+@dataclass(eq=False)
+class PoseArray:
+    """
+    PoseArray contains N poses stored as an array of positions with shape (N,3) and
+    an array of quaternions [x,y,z,w] with shape (N,4), as well as a frame in which
+    the poses are valid
+    """
+
+    positions: np.ndarray
+    quaternions: np.ndarray
+    frame: Frame
+
+    def __post_init__(self):
+        self.positions = np.ascontiguousarray(self.positions, dtype=float)
+        self.quaternions = np.ascontiguousarray(self.quaternions, dtype=float)
+        if self.positions.ndim != 2 or self.positions.shape[1] != 3:
+            raise ValueError("positions should have shape (N,3)")
+        if self.quaternions.ndim != 2 or self.quaternions.shape[1] != 4:
+            raise ValueError("quaternions should have shape (N,4)")
+        if self.positions.shape[0] != self.quaternions.shape[0]:
+            raise ValueError(
+                f"Expected the same number of positions and quaternions, got "
+                + f"{self.positions.shape[0]} and {self.quaternions.shape[0]}"
+            )
+
+    def to_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Tuple of numpy arrays of the positions and orientations as
+            quaternions with shapes (N,3) and (N,4) respectively
+        """
+        return self.positions, self.quaternions
+
+    @staticmethod
+    def from_array(
+        pos_array: np.ndarray, quat_array: np.ndarray, frame: Frame
+    ) -> PoseArray:
+        """
+        :param pos_array: Numpy array of shape (N,3) containing positions [x,y,z]
+        :param quat_array: Numpy array of shape (N,4) containing orientations as
+            quaternions [x,y,z,w]
+        :param frame: Frame of the poses
+        :return: PoseArray object
+        """
+        return PoseArray(positions=pos_array, quaternions=quat_array, frame=frame)
+
+    def to_positions(self) -> Positions:
+        """
+        :return: Positions object sharing the position array of the poses
+        """
+        return Positions.from_array(self.positions, frame=self.frame)
+
+    def to_orientations(self) -> List[Orientation]:
+        """
+        :return: List of the orientations of the poses
+        """
+        return [
+            Orientation(x=x, y=y, z=z, w=w, frame=self.frame)
+            for x, y, z, w in self.quaternions.tolist()
+        ]
+
+    @staticmethod
+    def from_orientations(
+        positions: Positions, orientations: List[Orientation]
+    ) -> PoseArray:
+        """
+        :param positions: Positions of the poses
+        :param orientations: List of orientations of the poses, in the same frame as
+            the positions
+        :return: PoseArray object
+        """
+        if any(orientation.frame != positions.frame for orientation in orientations):
+            raise ValueError("The orientations must be in the frame of the positions")
+        quat_array = np.array(
+            [[o.x, o.y, o.z, o.w] for o in orientations], dtype=float
+        ).reshape(-1, 4)
+        return PoseArray(positions.to_array(), quat_array, frame=positions.frame)
+
+    def to_poses(self) -> List[Pose]:
+        """
+        :return: List of the poses as Pose objects
+        """
+        return [
+            Pose(position, orientation, self.frame)
+            for position, orientation in zip(
+                self.to_positions(), self.to_orientations()
+            )
+        ]
+
+    @staticmethod
+    def from_poses(poses: List[Pose], frame: Frame) -> PoseArray:
+        """
+        :param poses: List of poses, all in the given frame
+        :param frame: Frame of the poses
+        :return: PoseArray object
+        """
+        if any(pose.frame != frame for pose in poses):
+            raise ValueError(f"All poses must be in frame {frame}")
+        pos_array = np.array(
+            [[p.position.x, p.position.y, p.position.z] for p in poses], dtype=float
+        ).reshape(-1, 3)
+        quat_array = np.array(
+            [
+                [p.orientation.x, p.orientation.y, p.orientation.z, p.orientation.w]
+                for p in poses
+            ],
+            dtype=float,
+        ).reshape(-1, 4)
+        return PoseArray(pos_array, quat_array, frame=frame)
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+    def __getitem__(self, index: int) -> Pose:
+        return Pose.from_array(
+            self.positions[index], self.quaternions[index], self.frame
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PoseArray):
+            return NotImplemented
+        return (
+            self.frame == other.frame
+            and np.array_equal(self.positions, other.positions)
+            and np.array_equal(self.quaternions, other.quaternions)
+        )
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List, Optional, Union, overload
 
 import numpy as np
 
+from ._slots import slotted_dataclass
 from .frame import Frame
 
 
-@dataclass
+@slotted_dataclass
 class Position:
     """
     Position contains the x, y and z coordinate as well as a frame
@@ -37,43 +37,139 @@ class Position:
         return Position(x=position[0], y=position[1], z=position[2], frame=frame)
 
 
-@dataclass
 class Positions:
     """
     Positions contains a list of positions as well as a frame in which the points
-    are valid
+    are valid.
+
+    The coordinates are stored in one contiguous array of shape (N,3). The Position
+    objects in the list are only created when the positions are accessed, indexed
+    or iterated over. Once the list has been handed out it may be changed by the
+    caller, so from then on the list is used and the array is rebuilt from it.
     """
 
-    positions: List[Position]
+    __slots__ = ("frame", "_array", "_positions")
+
     frame: Frame
+    _array: np.ndarray
+    _positions: Optional[List[Position]]
+
+    def __init__(self, positions: List[Position], frame: Frame) -> None:
+        self.frame = frame
+        self.positions = positions
+
+    @property
+    def positions(self) -> List[Position]:
+        """
+        :return: List of the positions, created from the array on first access
+        """
+        if self._positions is None:
+            self._positions = [
+                Position(x=x, y=y, z=z, frame=self.frame)
+                for x, y, z in self._array.tolist()
+            ]
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions: List[Position]) -> None:
+        self._positions = positions
+        self._array = _array_from_list(positions)
 
     def to_array(self) -> np.ndarray:
         """
-        :return: Numpy array of positions, shape (N,3)
+        :return: Numpy array of positions, shape (N,3). The array is not copied, and
+            is shared with the Positions object, unless the list of positions has
+            been accessed. Then the array is rebuilt from the list, which may have
+            been changed since.
         """
-        positions = []
-        for position in self.positions:
-            positions.append([position.x, position.y, position.z])
-        return np.array(positions, dtype=float)
+        if self._positions is not None:
+            self._array = _array_from_list(self._positions)
+        return self._array
 
     @staticmethod
     def from_array(position_array: np.ndarray, frame: Frame) -> Positions:
         """
         :param position_array: Numpy array of positions i.e. [[x,y,z],[x,y,z]].
-            Needs to be shape (N,3)
+            Needs to be shape (N,3). The array is only copied if it is not a
+            contiguous float array
         :param frame: Frame of positions
         """
-        if len(position_array.shape) < 2 or position_array.shape[1] != 3:
+        position_array = np.ascontiguousarray(position_array, dtype=float)
+        if position_array.ndim != 2 or position_array.shape[1] != 3:
             raise ValueError("position_array should have shape (N,3)")
-        positions: List[Position] = []
-        for position in position_array:
-            positions.append(
-                Position(x=position[0], y=position[1], z=position[2], frame=frame)
-            )
-        return Positions(positions=positions, frame=frame)
+        positions: Positions = Positions.__new__(Positions)
+        positions.frame = frame
+        positions._array = position_array
+        positions._positions = None
+        return positions
+
+    def __len__(self) -> int:
+        if self._positions is not None:
+            return len(self._positions)
+        return self._array.shape[0]
+
+    @overload
+    def __getitem__(self, index: int) -> Position: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Positions: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Position, Positions]:
+        if isinstance(index, slice):
+            return Positions.from_array(self.to_array()[index], frame=self.frame)
+        if self._positions is not None:
+            return self._positions[index]
+        x, y, z = self._array[index].tolist()
+        return Position(x=x, y=y, z=z, frame=self.frame)
+
+    def __iter__(self) -> Iterator[Position]:
+        if self._positions is not None:
+            return iter(self._positions)
+        return (
+            Position(x=x, y=y, z=z, frame=self.frame)
+            for x, y, z in self._array.tolist()
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Positions):
+            return NotImplemented
+        return self.frame == other.frame and np.array_equal(
+            self.to_array(), other.to_array()
+        )
+
+    def __repr__(self) -> str:
+        return f"Positions(positions={self.to_array()!r}, frame={self.frame!r})"
 
     def __str__(self):
         """
         :return: Unique string representation of the position, ignoring the frame
         """
         return "(" + str(self.x) + "," + str(self.y) + "," + str(self.z) + ")"
+
+
+def _array_from_list(positions: List[Position]) -> np.ndarray:
+    return np.array(
+        [[position.x, position.y, position.z] for position in positions],
+        dtype=float,
+    ).reshape(-1, 3)
+
+
+def _positions_to_array(
+    positions: Union[Positions, np.ndarray], frame: Frame
+) -> np.ndarray:
+    """
+    :param positions: Positions in frame, or an array of shape (N,3) assumed to be
+        in frame
+    :param frame: Frame the positions are expected in
+    :return: Numpy array of shape (N,3)
+    """
+    if isinstance(positions, Positions):
+        if positions.frame != frame:
+            raise ValueError(
+                f"Expected positions in frame {frame}, got positions in "
+                + f"frame {positions.frame}"
+            )
+        return positions.to_array()
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError("positions should have shape (N,3)")
+    return positions
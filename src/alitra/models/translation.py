@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 import numpy as np
 
 from alitra.models import Frame
 
+from ._slots import slotted_dataclass
+
 
-@dataclass
+@slotted_dataclass
 class Translation:
     """
     A translation between two frames represented as x, y and z
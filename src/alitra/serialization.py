@@ -0,0 +1,200 @@
+"""
+Binary serialization of Map, MapAlignment and Transform for fast loading.
+
+The models are stored as uncompressed numpy .npz files. Frames and names are stored
+as string arrays, so nothing is pickled. Reference positions are stored as one
+(N,3) float array, which can be memory-mapped straight from the file. Memory-mapped
+maps load in about the same time regardless of the number of reference positions,
+and the operating system shares the pages read-only between processes.
+"""
+
+from __future__ import annotations
+
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import numpy as np
+
+from .models.bounds import Bounds
+from .models.frame import Frame
+from .models.map import Map, MapAlignment
+from .models.position import Position, Positions
+from .models.translation import Translation
+from .transform import Transform
+
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def save_map(map: Map, path: Union[str, Path]) -> None:
+    """
+    :param map: Map to save
+    :param path: Path of the .npz-file
+    """
+    _save_arrays(path, "map", _map_to_arrays(map, prefix=""))
+
+
+def load_map(path: Union[str, Path], mmap: bool = False) -> Map:
+    """
+    :param path: Path of a .npz-file written by save_map
+    :param mmap: Set to true to memory-map the reference positions read-only
+        instead of reading them into memory
+    :return: Map object
+    """
+    arrays = _load_arrays(path, "map", mmap)
+    return _map_from_arrays(arrays, prefix="")
+
+
+def save_map_alignment(map_alignment: MapAlignment, path: Union[str, Path]) -> None:
+    """
+    :param map_alignment: MapAlignment to save
+    :param path: Path of the .npz-file
+    """
+    _save_arrays(
+        path,
+        "map_alignment",
+        {
+            "name": np.array(map_alignment.name),
+            **_map_to_arrays(map_alignment.map_from, prefix="map_from."),
+            **_map_to_arrays(map_alignment.map_to, prefix="map_to."),
+        },
+    )
+
+
+def load_map_alignment(path: Union[str, Path], mmap: bool = False) -> MapAlignment:
+    """
+    :param path: Path of a .npz-file written by save_map_alignment
+    :param mmap: Set to true to memory-map the reference positions read-only
+        instead of reading them into memory
+    :return: MapAlignment object
+    """
+    arrays = _load_arrays(path, "map_alignment", mmap)
+    return MapAlignment(
+        name=str(arrays["name"]),
+        map_from=_map_from_arrays(arrays, prefix="map_from."),
+        map_to=_map_from_arrays(arrays, prefix="map_to."),
+    )
+
+
+def save_transform(transform: Transform, path: Union[str, Path]) -> None:
+    """
+    :param transform: Transform to save
+    :param path: Path of the .npz-file
+    """
+    _save_arrays(
+        path,
+        "transform",
+        {
+            "from_": np.array(transform.from_.name),
+            "to_": np.array(transform.to_.name),
+            "quaternion": transform.rotation.as_quat(),
+            "translation": transform.translation.to_array(),
+            "translation_from": np.array(transform.translation.from_.name),
+            "translation_to": np.array(transform.translation.to_.name),
+        },
+    )
+
+
+def load_transform(path: Union[str, Path]) -> Transform:
+    """
+    :param path: Path of a .npz-file written by save_transform
+    :return: Transform object
+    """
+    arrays = _load_arrays(path, "transform", mmap=False)
+    return Transform.from_quat_array(
+        translation=Translation.from_array(
+            arrays["translation"],
+            from_=Frame(str(arrays["translation_from"])),
+            to_=Frame(str(arrays["translation_to"])),
+        ),
+        quat=arrays["quaternion"],
+        from_=Frame(str(arrays["from_"])),
+        to_=Frame(str(arrays["to_"])),
+    )
+
+
+def _save_arrays(path: Union[str, Path], kind: str, arrays: Dict[str, Any]) -> None:
+    # np.savez appends .npz to paths without it, a file handle keeps the path as given
+    # so that the load functions find the file at the same path
+    with open(path, "wb") as npz_file:
+        np.savez(npz_file, kind=np.array(kind), **arrays)
+
+
+def _map_to_arrays(map: Map, prefix: str) -> Dict[str, np.ndarray]:
+    arrays = {
+        "name": np.array(map.name),
+        "frame": np.array(map.frame.name),
+        "reference_positions": map.reference_positions.to_array(),
+        "reference_positions_frame": np.array(map.reference_positions.frame.name),
+    }
+    if map.bounds is not None:
+        arrays["bounds"] = np.array(
+            [map.bounds.position1.to_array(), map.bounds.position2.to_array()]
+        )
+        arrays["bounds_frame"] = np.array(map.bounds.frame.name)
+    return {prefix + key: value for key, value in arrays.items()}
+
+
+def _map_from_arrays(arrays: Dict[str, np.ndarray], prefix: str) -> Map:
+    bounds = None
+    if prefix + "bounds" in arrays:
+        bounds_frame = Frame(str(arrays[prefix + "bounds_frame"]))
+        bounds = Bounds(
+            position1=Position.from_array(arrays[prefix + "bounds"][0], bounds_frame),
+            position2=Position.from_array(arrays[prefix + "bounds"][1], bounds_frame),
+        )
+    return Map(
+        name=str(arrays[prefix + "name"]),
+        frame=Frame(str(arrays[prefix + "frame"])),
+        reference_positions=Positions.from_array(
+            arrays[prefix + "reference_positions"],
+            frame=Frame(str(arrays[prefix + "reference_positions_frame"])),
+        ),
+        bounds=bounds,
+    )
+
+
+def _load_arrays(
+    path: Union[str, Path], kind: str, mmap: bool
+) -> Dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as npz:
+        if "kind" not in npz.files or str(npz["kind"]) != kind:
+            raise ValueError(f"{path} does not contain a saved {kind}")
+        names = [name for name in npz.files if name.endswith("reference_positions")]
+        arrays = {name: npz[name] for name in npz.files if not (mmap and name in names)}
+    if mmap:
+        for name in names:
+            arrays[name] = _memmap_npz_member(path, name)
+    return arrays
+
+
+def _memmap_npz_member(path: Union[str, Path], name: str) -> np.ndarray:
+    """Memory-maps an array stored uncompressed in a .npz-file, read-only"""
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} in {path} is compressed and can not be memory-mapped")
+
+    with open(path, "rb") as file:
+        file.seek(info.header_offset)
+        local_header = file.read(_ZIP_LOCAL_HEADER_SIZE)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        file.seek(
+            info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+        )
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
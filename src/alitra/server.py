@@ -0,0 +1,395 @@
+"""
+Transform server and client communicating over a Unix socket.
+
+One process keeps the transforms in a TransformGraph, and other processes send it
+positions to transform. Requests arriving at the same time are grouped by frame pair
+and transformed with one vectorized call per group.
+
+Each request is a header (request id, length of the two frame names, number of
+positions), the utf-8 frame names and the positions as little-endian float64 values.
+Each response is a header (request id, status, number of positions or length of the
+error message) followed by the positions or the utf-8 error message. The responses on
+a connection are sent in the order of the requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from .models.frame import Frame
+from .models.position import Position, Positions
+from .transform_graph import TransformGraph
+
+_REQUEST_HEADER = struct.Struct("<IHHI")
+_RESPONSE_HEADER = struct.Struct("<IBI")
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+_DTYPE = np.dtype("<f8")
+# Requests read from a connection whose responses are not yet written. Reading
+# pauses at this limit, so a client that does not read its responses can not
+# make the server buffer without bound.
+_MAX_IN_FLIGHT = 1024
+
+
+@dataclass
+class _Request:
+    from_name: str
+    to_name: str
+    array: np.ndarray
+    future: asyncio.Future
+
+
+class TransformServer:
+    """
+    Asyncio server answering transform requests for the frames of a TransformGraph
+    """
+
+    def __init__(
+        self,
+        graph: TransformGraph,
+        socket_path: Union[str, Path],
+        max_batch_size: int = 4096,
+        max_batch_delay: float = 0.0,
+    ) -> None:
+        """
+        :param graph: TransformGraph with the transforms to serve
+        :param socket_path: Path of the Unix socket to listen on
+        :param max_batch_size: Largest number of requests transformed together
+        :param max_batch_delay: Seconds to wait for more requests before a batch is
+            transformed. With 0 the batch holds the requests that arrived while the
+            previous batch was transformed.
+        """
+        self.graph = graph
+        self.socket_path = str(socket_path)
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """
+        Starts listening on the socket. A socket left at socket_path is replaced.
+        :raises ValueError: If a file that is not a socket exists at socket_path
+        """
+        _remove_socket(self.socket_path)
+        self._queue = asyncio.Queue()
+        self._batch_task = asyncio.ensure_future(self._batch_loop())
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the server if needed and serves until cancelled
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()  # type: ignore
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Stops the server and removes the socket
+        """
+        tasks = list(self._connections)
+        if self._batch_task is not None:
+            tasks.append(self._batch_task)
+            self._batch_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        _remove_socket(self.socket_path)
+
+    async def __aenter__(self) -> TransformServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        task: asyncio.Task = asyncio.current_task()  # type: ignore
+        self._connections.add(task)
+        responses: asyncio.Queue = asyncio.Queue()
+        in_flight = asyncio.Semaphore(_MAX_IN_FLIGHT)
+        write_task = asyncio.ensure_future(
+            _write_responses(writer, responses, in_flight)
+        )
+        try:
+            while True:
+                await in_flight.acquire()
+                header = await reader.readexactly(_REQUEST_HEADER.size)
+                request_id, from_length, to_length, n_positions = (
+                    _REQUEST_HEADER.unpack(header)
+                )
+                names = await reader.readexactly(from_length + to_length)
+                data = await reader.readexactly(n_positions * 3 * _DTYPE.itemsize)
+
+                future = loop.create_future()
+                responses.put_nowait((request_id, future))
+                try:
+                    from_name = names[:from_length].decode()
+                    to_name = names[from_length:].decode()
+                except UnicodeDecodeError:
+                    future.set_exception(ValueError("Frame names must be utf-8"))
+                    continue
+                self._queue.put_nowait(  # type: ignore
+                    _Request(
+                        from_name=from_name,
+                        to_name=to_name,
+                        array=np.frombuffer(data, dtype=_DTYPE).reshape(-1, 3),
+                        future=future,
+                    )
+                )
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            # The client has closed its side, the remaining responses are sent
+            responses.put_nowait(None)
+            await write_task
+        except asyncio.CancelledError:
+            # Cancelled by close. The task ends normally, since the stream protocol
+            # logs handlers that end with an exception.
+            pass
+        finally:
+            write_task.cancel()
+            await asyncio.gather(write_task, return_exceptions=True)
+            writer.close()
+            self._connections.discard(task)
+
+    async def _batch_loop(self) -> None:
+        queue: asyncio.Queue = self._queue  # type: ignore
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(self.max_batch_delay)
+            while not queue.empty() and len(batch) < self.max_batch_size:
+                batch.append(queue.get_nowait())
+            try:
+                self._transform_batch(batch)
+            except Exception as e:
+                # A failing batch is answered with the error, and later batches are
+                # still transformed
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _transform_batch(self, batch: List[_Request]) -> None:
+        groups: Dict[Tuple[str, str], List[_Request]] = defaultdict(list)
+        for request in batch:
+            groups[(request.from_name, request.to_name)].append(request)
+
+        # Names are looked up instead of creating Frame objects, since every new
+        # Frame is kept in the registry of frames for the life of the process
+        frames = {frame.name: frame for frame in self.graph.frames}
+        for (from_name, to_name), requests in groups.items():
+            try:
+                unknown = [name for name in (from_name, to_name) if name not in frames]
+                if unknown:
+                    raise ValueError(f"Unknown frames {unknown}, not in the graph")
+                from_, to_ = frames[from_name], frames[to_name]
+                transform = self.graph.get_transform(from_, to_)
+                result = transform.transform_array(
+                    np.concatenate([request.array for request in requests]),
+                    from_,
+                    to_,
+                )
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            start = 0
+            for request in requests:
+                end = start + request.array.shape[0]
+                # The future is cancelled if its connection was closed
+                if not request.future.done():
+                    request.future.set_result(result[start:end])
+                start = end
+
+
+def _remove_socket(path: str) -> None:
+    """Removes the socket at path, and refuses to remove any other kind of file"""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+
+async def _write_responses(
+    writer: asyncio.StreamWriter, responses: asyncio.Queue, in_flight: asyncio.Semaphore
+) -> None:
+    """Writes the responses of a connection in the order the requests arrived"""
+    try:
+        while True:
+            response = await responses.get()
+            if response is None:
+                return
+            request_id, future = response
+            try:
+                result = await future
+            except Exception as e:
+                payload = str(e).encode()
+                header = _RESPONSE_HEADER.pack(request_id, _STATUS_ERROR, len(payload))
+            else:
+                payload = np.ascontiguousarray(result, dtype=_DTYPE).tobytes()
+                header = _RESPONSE_HEADER.pack(
+                    request_id, _STATUS_OK, len(payload) // (3 * _DTYPE.itemsize)
+                )
+            writer.write(header + payload)
+            await writer.drain()
+            in_flight.release()
+    except ConnectionError:
+        pass
+
+
+class TransformClient:
+    """
+    Asyncio client for a TransformServer. Many requests can be in flight at the same
+    time on one connection.
+    """
+
+    def __init__(self, socket_path: Union[str, Path]) -> None:
+        """
+        :param socket_path: Path of the Unix socket the server listens on
+        """
+        self.socket_path = str(socket_path)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+
+    async def connect(self) -> None:
+        """
+        Opens the connection to the server
+        """
+        self._reader, self._writer = await asyncio.open_unix_connection(
+            self.socket_path
+        )
+        self._read_task = asyncio.ensure_future(self._read_loop())
+
+    async def close(self) -> None:
+        """
+        Closes the connection to the server
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._read_task is not None:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+            self._read_task = None
+        self._fail_pending(ConnectionError("The client was closed"))
+
+    async def __aenter__(self) -> TransformClient:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def transform_array(
+        self, array: np.ndarray, from_: Frame, to_: Frame
+    ) -> np.ndarray:
+        """
+        :param array: Numpy array of positions in the from_ frame, shape (3,) or (N,3)
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Numpy array of positions in the to_ frame, same shape as array
+        """
+        if self._writer is None:
+            raise ConnectionError("The client is not connected")
+        data = np.ascontiguousarray(array, dtype=_DTYPE)
+        if data.shape[-1] != 3 or data.ndim > 2:
+            raise ValueError("array should have shape (3,) or (N,3)")
+        from_name, to_name = from_.name.encode(), to_.name.encode()
+
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) % 2**32
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(
+            _REQUEST_HEADER.pack(
+                request_id, len(from_name), len(to_name), data.size // 3
+            )
+            + from_name
+            + to_name
+            + data.tobytes()
+        )
+        await self._writer.drain()
+        result = await future
+        return result.reshape(array.shape)
+
+    async def transform_position(
+        self, positions: Union[Position, Positions], from_: Frame, to_: Frame
+    ) -> Union[Position, Positions]:
+        """
+        :param positions: Position or Positions in the from_ frame
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Position or Positions in the to_ frame
+        """
+        if positions.frame != from_:
+            raise ValueError(
+                f"Expected positions in frame {from_} "
+                + f", got positions in frame {positions.frame}"
+            )
+        result = await self.transform_array(positions.to_array(), from_, to_)
+        if isinstance(positions, Position):
+            return Position.from_array(result, to_)
+        return Positions.from_array(result, to_)
+
+    async def _read_loop(self) -> None:
+        reader: asyncio.StreamReader = self._reader  # type: ignore
+        error = ConnectionError("The client was closed")
+        try:
+            while True:
+                header = await reader.readexactly(_RESPONSE_HEADER.size)
+                request_id, status, length = _RESPONSE_HEADER.unpack(header)
+                if status == _STATUS_OK:
+                    data = await reader.readexactly(length * 3 * _DTYPE.itemsize)
+                else:
+                    message = await reader.readexactly(length)
+
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if status == _STATUS_OK:
+                    future.set_result(np.frombuffer(data, dtype=_DTYPE).copy())
+                else:
+                    future.set_exception(ValueError(message.decode()))
+        except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+            error = ConnectionError(f"Connection lost: {e}")
+        finally:
+            # Also runs when the task is cancelled by close, so no request waits
+            # for a response that will never be read
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
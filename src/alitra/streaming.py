@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .models.frame import Frame
+from .models.orientation import Orientation
+from .models.pose import Pose
+from .models.position import Position
+from .transform import Transform
+
+StreamItem = Union[Position, Pose, np.ndarray]
+
+
+def stream_transform(
+    transform: Transform,
+    items: Iterable[StreamItem],
+    from_: Frame,
+    to_: Frame,
+    batch_size: int = 1024,
+    max_latency: Optional[float] = None,
+) -> Iterator[StreamItem]:
+    """
+    Lazily transforms a stream of positions and poses from from_ to to_.
+
+    The items are collected into micro-batches, and each batch is transformed with one
+    vectorized call for the positions and one for the orientations. The results are
+    yielded in the order the items arrived, with the same type as the input.
+    :param transform: Transform between from_ and to_
+    :param items: Iterable of Position, Pose or numpy arrays of shape (3,) or (N,3).
+        Arrays are assumed to be in the from_ frame.
+    :param from_: Source Frame
+    :param to_: Destination Frame
+    :param batch_size: A batch is transformed when it holds this many items
+    :param max_latency: A batch is also transformed when its first item has waited
+        this many seconds, also while no new item arrives. The items are then read
+        from items on a background thread, at most batch_size items ahead.
+    :return: Iterator of the transformed items
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    batch: List[StreamItem] = []
+    if max_latency is None:
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield from _transform_batch(transform, batch, from_, to_)
+                batch = []
+        if batch:
+            yield from _transform_batch(transform, batch, from_, to_)
+        return
+
+    queue: Queue = Queue(maxsize=batch_size)
+    stop = threading.Event()
+    threading.Thread(target=_read_items, args=(items, queue, stop), daemon=True).start()
+    try:
+        batch_start = 0.0
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(batch_start + max_latency - time.monotonic(), 0.0)
+            try:
+                is_item, value = queue.get(timeout=timeout)
+            except Empty:
+                # The first item of the batch has waited max_latency
+                yield from _transform_batch(transform, batch, from_, to_)
+                batch = []
+                continue
+            if not is_item:
+                if value is not None:
+                    raise value
+                break
+
+            if not batch:
+                batch_start = time.monotonic()
+            batch.append(value)
+            if (
+                len(batch) >= batch_size
+                or time.monotonic() - batch_start >= max_latency
+            ):
+                yield from _transform_batch(transform, batch, from_, to_)
+                batch = []
+    finally:
+        stop.set()
+    if batch:
+        yield from _transform_batch(transform, batch, from_, to_)
+
+
+def _read_items(
+    items: Iterable[StreamItem], queue: Queue, stop: threading.Event
+) -> None:
+    """
+    Puts (True, item) on the queue for every item, and then (False, None) at the end
+    of the items or (False, exception) if reading them failed
+    """
+    end: Tuple[bool, Optional[Exception]] = (False, None)
+    try:
+        for item in items:
+            if not _put(queue, (True, item), stop):
+                return
+    except Exception as e:
+        end = (False, e)
+    _put(queue, end, stop)
+
+
+def _put(queue: Queue, entry: tuple, stop: threading.Event) -> bool:
+    """Waits for room on the queue until the stream is stopped"""
+    while not stop.is_set():
+        try:
+            queue.put(entry, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _transform_batch(
+    transform: Transform, batch: List[StreamItem], from_: Frame, to_: Frame
+) -> List[StreamItem]:
+    """Transforms all positions and all orientations of a batch in one call each"""
+    segments: List[np.ndarray] = []
+    rows: List[List[float]] = []
+    quaternions: List[List[float]] = []
+    for item in batch:
+        if isinstance(item, Pose):
+            _check_frame(item.frame, from_)
+            position, orientation = item.position, item.orientation
+            rows.append([position.x, position.y, position.z])
+            quaternions.append(
+                [orientation.x, orientation.y, orientation.z, orientation.w]
+            )
+        elif isinstance(item, Position):
+            _check_frame(item.frame, from_)
+            rows.append([item.x, item.y, item.z])
+        elif not isinstance(item, np.ndarray):
+            raise TypeError(
+                "Expected items of type Position, Pose or numpy array, "
+                + f"got {type(item).__name__}"
+            )
+        elif item.shape == (3,):
+            rows.append(item.tolist())
+        elif item.ndim == 2 and item.shape[1] == 3:
+            if rows:
+                segments.append(np.array(rows, dtype=float))
+                rows = []
+            segments.append(item)
+        else:
+            raise ValueError(
+                f"Expected arrays of shape (3,) or (N,3), got {item.shape}"
+            )
+    if from_ == to_:
+        return batch
+    if rows:
+        segments.append(np.array(rows, dtype=float))
+
+    positions = transform.transform_array(np.concatenate(segments), from_, to_)
+    if quaternions:
+        rotations = transform.transform_quat_array(np.array(quaternions), from_, to_)
+
+    results: List[StreamItem] = []
+    row = 0
+    quaternion = 0
+    for item in batch:
+        if isinstance(item, Pose):
+            x, y, z = positions[row].tolist()
+            qx, qy, qz, qw = rotations[quaternion].tolist()
+            results.append(
+                Pose(
+                    Position(x=x, y=y, z=z, frame=to_),
+                    Orientation(x=qx, y=qy, z=qz, w=qw, frame=to_),
+                    to_,
+                )
+            )
+            row += 1
+            quaternion += 1
+        elif isinstance(item, Position):
+            x, y, z = positions[row].tolist()
+            results.append(Position(x=x, y=y, z=z, frame=to_))
+            row += 1
+        elif item.ndim == 1:
+            results.append(positions[row])
+            row += 1
+        else:
+            results.append(positions[row : row + len(item)])
+            row += len(item)
+    return results
+
+
+def _check_frame(frame: Frame, from_: Frame) -> None:
+    if frame != from_:
+        raise ValueError(f"Expected items in frame {from_}, got item in frame {frame}")
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
-from scipy.spatial.transform import Rotation
 
+from . import _quaternion, metrics
 from .models.frame import Frame
 from .models.orientation import Orientation
-from .models.pose import Pose
+from .models.pose import Pose, PoseArray
 from .models.position import Position, Positions
 from .models.translation import Translation
 
+if TYPE_CHECKING:
+    from scipy.spatial.transform import Rotation
+
+_PARALLEL_MIN_POINTS = 200_000
+_PARALLEL_MIN_CHUNK_SIZE = 50_000
+_PARALLEL_CHUNKS_PER_THREAD = 4
+_PLANAR_ATOL = 1e-9
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
 
 @dataclass
 class Transform:
@@ -20,6 +37,10 @@ class Transform:
     Contains a scipy rotation object, a translation and two frames.
     Can be created from euler array or quaternion array. Translations must be
     expressed in the (to_) frame
+
+    The homogeneous matrix of the transform, its inverse and the inverse rotation
+    are computed on first use and cached until the rotation or translation is
+    replaced.
     """
 
     translation: Translation
@@ -36,17 +57,158 @@ class Transform:
                 f"The from_ frames or to_ frames of translation and transform object are not equal."
             )
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("translation", "rotation"):
+            for cached in (
+                "matrix",
+                "inverse_matrix",
+                "inverse_rotation",
+                "is_planar",
+                "_inverse",
+                "_quat",
+                "_inverse_quat",
+            ):
+                self.__dict__.pop(cached, None)
+
+    @cached_property
+    def matrix(self) -> np.ndarray:
+        """
+        :return: Homogeneous transformation matrix from from_ to to_, shape (4,4)
+        """
+        matrix = np.eye(4)
+        matrix[:3, :3] = self.rotation.as_matrix()
+        matrix[:3, 3] = self.translation.to_array()
+        return matrix
+
+    @cached_property
+    def inverse_matrix(self) -> np.ndarray:
+        """
+        :return: Homogeneous transformation matrix from to_ to from_, shape (4,4)
+        """
+        matrix = np.eye(4)
+        matrix[:3, :3] = self.matrix[:3, :3].T
+        matrix[:3, 3] = -matrix[:3, :3] @ self.matrix[:3, 3]
+        return matrix
+
+    @cached_property
+    def inverse_rotation(self) -> Rotation:
+        """
+        :return: Scipy Rotation object of the inverse rotation
+        """
+        return self.rotation.inv()
+
+    @cached_property
+    def is_planar(self) -> bool:
+        """
+        :return: True if the rotation is about the z-axis only, up to rounding errors
+            such as those of transforms composed from several rotations
+        """
+        rotation_matrix = self.matrix[:3, :3]
+        return bool(
+            np.allclose(rotation_matrix[2], [0, 0, 1], rtol=0, atol=_PLANAR_ATOL)
+            and np.allclose(rotation_matrix[:, 2], [0, 0, 1], rtol=0, atol=_PLANAR_ATOL)
+        )
+
+    @cached_property
+    def _quat(self) -> np.ndarray:
+        return self.rotation.as_quat()
+
+    @cached_property
+    def _inverse_quat(self) -> np.ndarray:
+        return _quaternion.conjugate(self._quat)
+
+    @cached_property
+    def _inverse(self) -> Transform:
+        inverse = Transform(
+            translation=Translation.from_array(
+                self.inverse_matrix[:3, 3], from_=self.to_, to_=self.from_
+            ),
+            from_=self.to_,
+            to_=self.from_,
+            rotation=self.inverse_rotation,
+        )
+        inverse.__dict__["_inverse"] = self
+        return inverse
+
+    def inverse(self) -> Transform:
+        """
+        :return: Transform from to_ to from_. The inverse is cached, and the inverse
+            of the inverse is this transform
+        """
+        return self._inverse
+
+    def transform_array(
+        self,
+        array: np.ndarray,
+        from_: Frame,
+        to_: Frame,
+        out: Optional[np.ndarray] = None,
+        n_threads: Optional[int] = 1,
+    ) -> np.ndarray:
+        """
+        Transforms an array of positions from from_ to to_ (rotation and translation)
+        using the cached homogeneous matrix. Transforms with a rotation about the
+        z-axis only also accept planar positions [x,y], which are transformed with
+        the 2x2 rotation and the x and y translation.
+
+        With more than one thread, arrays of at least 200 000 positions are split into
+        chunks that are transformed on a thread pool into one preallocated output.
+        Numpy releases the GIL while it works on the chunks.
+        :param array: Numpy array of positions in the from_ coordinate system,
+            shape (3,) or (N,3), or shape (2,) or (N,2) for planar transforms.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :param out: Optional array with the same shape as array to write the result to.
+        :param n_threads: Number of threads to use, None for one per available core.
+            At most one thread per available core is used.
+        :return: Numpy array of positions in the to_ coordinate system.
+        """
+        if from_ == to_:
+            if out is None:
+                return array
+            out[...] = array
+            return out
+
+        if from_ == self.from_ and to_ == self.to_:
+            matrix = self.matrix
+        elif from_ == self.to_ and to_ == self.from_:
+            matrix = self.inverse_matrix
+        else:
+            raise ValueError("Transform not specified")
+
+        dim = array.shape[-1] if array.ndim in (1, 2) else 0
+        if dim not in (2, 3):
+            raise ValueError(
+                f"array should have shape (3,) or (N,3), got {array.shape}"
+            )
+        if dim == 2 and not self.is_planar:
+            raise ValueError("Planar positions require a rotation about the z-axis")
+        rotation, translation = matrix[:dim, :dim].T, matrix[:dim, 3]
+        n_threads = _available_cores() if n_threads is None else n_threads
+        n_threads = min(n_threads, _available_cores())
+        if n_threads > 1 and array.ndim == 2 and array.shape[0] >= _PARALLEL_MIN_POINTS:
+            return _transform_array_parallel(
+                array, rotation, translation, out, n_threads
+            )
+
+        result = np.matmul(array, rotation, out=out)
+        result += translation
+        return result
+
     def transform_position(
         self,
         positions: Union[Position, Positions],
         from_: Frame,
         to_: Frame,
+        n_threads: Optional[int] = 1,
     ) -> Union[Position, Positions]:
         """
         Transforms a position or list of positions from from_ to to_ (rotation and translation)
         :param positions: Position or Positions in the from_ coordinate system.
         :param from_: Source Frame, must be different to "to_".
         :param to_: Destination Frame, must be different to "from_".
+        :param n_threads: Number of threads for large Positions, see transform_array.
         :return: Position or Positions in the to_ coordinate system.
         """
         if positions.frame != from_:
@@ -58,27 +220,23 @@ class Transform:
         if from_ == to_:
             return positions
 
-        result: np.ndarray
-        if from_ == self.to_ and to_ == self.from_:
-            """Using the inverse transform"""
-            result = self.rotation.apply(
-                positions.to_array() - self.translation.to_array(),
-                inverse=True,
-            )
-        elif from_ == self.from_ and to_ == self.to_:
-            result = (
-                self.rotation.apply(positions.to_array()) + self.translation.to_array()
-            )
-        else:
-            raise ValueError("Transform not specified")
+        start = time.perf_counter() if metrics._sinks else None
+        result = self.transform_array(
+            positions.to_array(), from_, to_, n_threads=n_threads
+        )
 
+        transformed: Union[Position, Positions]
         if isinstance(positions, Position):
-            return Position.from_array(result, to_)
+            transformed = Position.from_array(result, to_)
         elif isinstance(positions, Positions):
-            return Positions.from_array(result, to_)
+            transformed = Positions.from_array(result, to_)
         else:
             raise ValueError("Incorrect input format. Must be Position or Positions.")
 
+        if start is not None:
+            metrics._record("transform_position", start, result.size // 3)
+        return transformed
+
     def transform_rotation(
         self, rotation: Rotation, from_: Frame, to_: Frame
     ) -> Rotation:
@@ -92,7 +250,7 @@ class Transform:
 
         if from_ == self.to_ and to_ == self.from_:
             "Using the inverse transform"
-            rotation_to = rotation * self.rotation.inv()
+            rotation_to = rotation * self.inverse_rotation
         elif from_ == self.from_ and to_ == self.to_:
             rotation_to = rotation * self.rotation
         else:
@@ -100,6 +258,28 @@ class Transform:
 
         return rotation_to
 
+    def transform_quat_array(
+        self, quat: np.ndarray, from_: Frame, to_: Frame
+    ) -> np.ndarray:
+        """
+        Transforms orientations given as quaternions from from_ to to_ (rotation),
+        without creating scipy Rotation objects. Gives the same quaternions as
+        transform_rotation.
+        :param quat: Numpy array of quaternions [x,y,z,w] in the from_ coordinate
+            system, shape (4,) or (N,4).
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Numpy array of unit quaternions in the to_ coordinate system.
+        """
+        if from_ == self.from_ and to_ == self.to_:
+            rotation_quat = self._quat
+        elif from_ == self.to_ and to_ == self.from_:
+            rotation_quat = self._inverse_quat
+        else:
+            raise ValueError("Transform not specified")
+
+        return _quaternion.multiply(_quaternion.normalize(quat), rotation_quat)
+
     def transform_orientation(
         self,
         orientation: Orientation,
@@ -117,8 +297,14 @@ class Transform:
         if from_ == to_:
             return orientation
 
-        rotation_to = self.transform_rotation(orientation.to_rotation(), from_, to_)
-        return Orientation(*rotation_to.as_quat(), frame=to_)  # type: ignore
+        start = time.perf_counter() if metrics._sinks else None
+        x, y, z, w = self.transform_quat_array(
+            orientation.to_quat_array(), from_, to_
+        ).tolist()
+
+        if start is not None:
+            metrics._record("transform_orientation", start, 1)
+        return Orientation(x=x, y=y, z=z, w=w, frame=to_)
 
     def transform_pose(self, pose: Pose, from_: Frame, to_: Frame) -> Pose:
         """
@@ -141,6 +327,32 @@ class Transform:
 
         return Pose(position, orientation, to_)
 
+    def transform_poses(self, poses: PoseArray, from_: Frame, to_: Frame) -> PoseArray:
+        """
+        Transforms an array of poses from from_ to to_ (rotation and translation).
+        All poses are transformed in one vectorized operation.
+        :param poses: PoseArray in the from_ coordinate system.
+        :param from_: Source Frame, must be different to "to_".
+        :param to_: Destination Frame, must be different to "from_".
+        :return: PoseArray in the to_ coordinate system.
+        """
+        if poses.frame != from_:
+            raise ValueError(
+                f"Expected poses in frame {from_} "
+                + f", got poses in frame {poses.frame}"
+            )
+
+        if from_ == to_:
+            return poses
+
+        start = time.perf_counter() if metrics._sinks else None
+        positions = self.transform_array(poses.positions, from_, to_)
+        quaternions = self.transform_quat_array(poses.quaternions, from_, to_)
+
+        if start is not None:
+            metrics._record("transform_poses", start, len(positions))
+        return PoseArray(positions, quaternions, to_)
+
     @staticmethod
     def from_euler_array(
         translation: Translation, euler: np.ndarray, from_: Frame, to_: Frame, seq="ZYX"
@@ -153,6 +365,8 @@ class Transform:
         :param seq: Sequence of axes for rotations, same as scipy rotation
         :return: Transform object
         """
+        from scipy.spatial.transform import Rotation
+
         return Transform(
             translation=translation,
             from_=from_,
@@ -160,6 +374,25 @@ class Transform:
             rotation=Rotation.from_euler(seq=seq, angles=euler),
         )
 
+    @staticmethod
+    def from_matrix(matrix: np.ndarray, from_: Frame, to_: Frame) -> Transform:
+        """
+        :param matrix: Homogeneous transformation matrix, shape (4,4)
+        :param from_: Frame the transform is coming from
+        :param to_: Frame the transform is going to
+        :return: Transform object
+        """
+        from scipy.spatial.transform import Rotation
+
+        if matrix.shape != (4, 4):
+            raise ValueError("matrix should have shape (4,4)")
+        return Transform(
+            translation=Translation.from_array(matrix[:3, 3], from_=from_, to_=to_),
+            from_=from_,
+            to_=to_,
+            rotation=Rotation.from_matrix(matrix[:3, :3]),
+        )
+
     @staticmethod
     def from_quat_array(
         translation: Translation,
@@ -174,6 +407,8 @@ class Transform:
         :param to_: Frame the transform is going to
         :return: Transform object
         """
+        from scipy.spatial.transform import Rotation
+
         rotation = Rotation.from_quat(quat)
         return Transform(
             translation=translation,
@@ -181,3 +416,66 @@ class Transform:
             to_=to_,
             rotation=rotation,
         )
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _parallel_chunk_size(n_points: int, n_threads: int) -> int:
+    """
+    Splits the positions into a few chunks per thread, so that threads finishing
+    early can take another chunk, but keeps the chunks large enough that the
+    per-chunk overhead is small compared to the work
+    """
+    n_chunks = n_threads * _PARALLEL_CHUNKS_PER_THREAD
+    return max(-(-n_points // n_chunks), _PARALLEL_MIN_CHUNK_SIZE)
+
+
+def _thread_pool() -> ThreadPoolExecutor:
+    """
+    One pool with a thread per available core is shared by all parallel
+    transforms, and shut down when the interpreter exits
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=_available_cores(), thread_name_prefix="alitra"
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def _transform_array_parallel(
+    array: np.ndarray,
+    rotation: np.ndarray,
+    translation: np.ndarray,
+    out: Optional[np.ndarray],
+    n_threads: int,
+) -> np.ndarray:
+    if out is None:
+        out = np.empty(array.shape, dtype=np.result_type(array, rotation))
+    result = out
+    chunk_size = _parallel_chunk_size(array.shape[0], n_threads)
+    starts = iter(range(0, array.shape[0], chunk_size))
+    starts_lock = threading.Lock()
+
+    def transform_chunks() -> None:
+        # n_threads workers take the chunks in turn, so a call uses no more threads
+        # than requested even though the shared pool may have more
+        while True:
+            with starts_lock:
+                start = next(starts, None)
+            if start is None:
+                return
+            chunk = slice(start, start + chunk_size)
+            np.matmul(array[chunk], rotation, out=result[chunk])
+            result[chunk] += translation
+
+    workers = [_thread_pool().submit(transform_chunks) for _ in range(n_threads)]
+    for worker in wait(workers).done:
+        worker.result()
+    return result
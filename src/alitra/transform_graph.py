@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .models.frame import Frame
+from .models.orientation import Orientation
+from .models.pose import Pose, PoseArray
+from .models.position import Position, Positions
+from .transform import Transform
+
+
+class TransformGraph:
+    """
+    A registry of frames connected by transforms. Any two frames that are connected
+    through a chain of transforms can be transformed between. The chain is found
+    once, fused into a single rotation and translation, and cached until one of the
+    transforms in the chain is replaced or removed.
+    """
+
+    def __init__(self, transforms: Optional[Iterable[Transform]] = None) -> None:
+        self._edges: Dict[Frame, Dict[Frame, Transform]] = {}
+        self._cache: Dict[
+            Tuple[Frame, Frame], Tuple[Transform, List[FrozenSet[Frame]]]
+        ] = {}
+        for transform in transforms or []:
+            self.add_transform(transform)
+
+    @property
+    def frames(self) -> List[Frame]:
+        """
+        :return: List of all frames in the graph
+        """
+        return list(self._edges)
+
+    def add_transform(self, transform: Transform) -> None:
+        """
+        Adds a transform between two frames. An existing transform between the same
+        two frames, in either direction, is replaced.
+        :param transform: Transform to add to the graph
+        """
+        from_, to_ = transform.from_, transform.to_
+        if from_ == to_:
+            raise ValueError("A transform must be between two different frames")
+        if to_ in self._edges.get(from_, {}):
+            self._invalidate(from_, to_)
+
+        self._edges.setdefault(from_, {})[to_] = transform
+        self._edges.setdefault(to_, {})[from_] = transform
+
+    def remove_transform(self, from_: Frame, to_: Frame) -> None:
+        """
+        Removes the transform between two frames, in either direction.
+        :param from_: One of the frames of the transform
+        :param to_: The other frame of the transform
+        """
+        if to_ not in self._edges.get(from_, {}):
+            raise ValueError(f"No transform between {from_} and {to_}")
+        self._invalidate(from_, to_)
+        del self._edges[from_][to_]
+        del self._edges[to_][from_]
+
+    def get_transform(self, from_: Frame, to_: Frame) -> Transform:
+        """
+        Finds the transform from from_ to to_ by chaining the transforms in the graph.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Transform from from_ to to_
+        """
+        key = (from_, to_)
+        if key in self._cache:
+            return self._cache[key][0]
+
+        path = self._find_path(from_, to_)
+        transform = self._fuse_path(path, from_, to_)
+        edges = [frozenset(pair) for pair in zip(path[:-1], path[1:])]
+        self._cache[key] = (transform, edges)
+        return transform
+
+    def transform_position(
+        self,
+        positions: Union[Position, Positions],
+        from_: Frame,
+        to_: Frame,
+    ) -> Union[Position, Positions]:
+        """
+        Transforms a position or list of positions from from_ to to_
+        :param positions: Position or Positions in the from_ coordinate system.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Position or Positions in the to_ coordinate system.
+        """
+        if from_ == to_:
+            return positions
+        return self.get_transform(from_, to_).transform_position(positions, from_, to_)
+
+    def transform_orientation(
+        self, orientation: Orientation, from_: Frame, to_: Frame
+    ) -> Orientation:
+        """
+        Transforms an orientation from from_ to to_
+        :param orientation: Orientation in the from_ coordinate system.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Orientation in the to_ coordinate system.
+        """
+        if from_ == to_:
+            return orientation
+        return self.get_transform(from_, to_).transform_orientation(
+            orientation, from_, to_
+        )
+
+    def transform_pose(self, pose: Pose, from_: Frame, to_: Frame) -> Pose:
+        """
+        Transforms a pose from from_ to to_
+        :param pose: Pose in the from_ coordinate system.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Pose in the to_ coordinate system.
+        """
+        if from_ == to_:
+            return pose
+        return self.get_transform(from_, to_).transform_pose(pose, from_, to_)
+
+    def transform_poses(self, poses: PoseArray, from_: Frame, to_: Frame) -> PoseArray:
+        """
+        Transforms an array of poses from from_ to to_
+        :param poses: PoseArray in the from_ coordinate system.
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: PoseArray in the to_ coordinate system.
+        """
+        if from_ == to_:
+            return poses
+        return self.get_transform(from_, to_).transform_poses(poses, from_, to_)
+
+    def _invalidate(self, from_: Frame, to_: Frame) -> None:
+        """Drops the cached transforms whose chain uses the edge between two frames"""
+        edge = frozenset((from_, to_))
+        self._cache = {
+            key: value for key, value in self._cache.items() if edge not in value[1]
+        }
+
+    def _find_path(self, from_: Frame, to_: Frame) -> List[Frame]:
+        """Breadth first search for the shortest chain of frames"""
+        if from_ not in self._edges or to_ not in self._edges:
+            raise ValueError(
+                f"Transform not specified, frames {from_.name} and {to_.name} must "
+                + "both be in the graph"
+            )
+        previous: Dict[Frame, Optional[Frame]] = {from_: None}
+        queue = deque([from_])
+        while queue:
+            frame = queue.popleft()
+            if frame == to_:
+                break
+            for neighbour in self._edges[frame]:
+                if neighbour not in previous:
+                    previous[neighbour] = frame
+                    queue.append(neighbour)
+
+        if to_ not in previous:
+            raise ValueError(
+                f"Transform not specified, no chain of transforms between {from_.name} "
+                + f"and {to_.name}"
+            )
+        path = [to_]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])  # type: ignore
+        return path[::-1]
+
+    def _fuse_path(self, path: List[Frame], from_: Frame, to_: Frame) -> Transform:
+        """Composes the transforms along the path into one transform"""
+        if len(path) == 2:
+            transform = self._edges[path[0]][path[1]]
+            if transform.from_ == path[0]:
+                return transform
+            return transform.inverse()
+
+        matrix = np.eye(4)
+        for edge_from, edge_to in zip(path[:-1], path[1:]):
+            edge = self._edges[edge_from][edge_to]
+            if edge.from_ == edge_from:
+                matrix = edge.matrix @ matrix
+            else:
+                matrix = edge.inverse_matrix @ matrix
+
+        return Transform.from_matrix(matrix, from_=from_, to_=to_)
@@ -79,6 +79,16 @@ def default_transform(default_translation, default_rotation, robot_frame, asset_
     )
 
 
+@pytest.fixture()
+def transform(robot_frame, asset_frame):
+    return Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+
+
 @pytest.fixture()
 def default_bounds(robot_position_1, robot_position_2):
     return Bounds(robot_position_1, robot_position_2)
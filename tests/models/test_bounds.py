@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from alitra import Bounds, Position
+from alitra import Bounds, Position, Positions
 
 
 def test_eq_bounds(default_bounds, robot_frame):
@@ -24,3 +25,28 @@ def test_position_wrong_frame(default_bounds, asset_frame):
     pos = Position(0.5, 0.5, 0.5, asset_frame)
     with pytest.raises(ValueError):
         default_bounds.position_within_bounds(pos)
+
+
+def test_positions_within_bounds(default_bounds, robot_frame):
+    array = np.array([[0.5, 0.5, 0.5], [11, 11, 11], [1, 0, 1], [0.5, -0.1, 0.5]])
+    positions = Positions.from_array(array, frame=robot_frame)
+    expected = np.array([True, False, True, False])
+
+    assert np.array_equal(expected, default_bounds.positions_within_bounds(positions))
+    assert np.array_equal(expected, default_bounds.positions_within_bounds(array))
+    assert np.array_equal(
+        [default_bounds.position_within_bounds(p) for p in positions], expected
+    )
+    assert np.array_equal(
+        array[expected], default_bounds.filter_positions(positions).to_array()
+    )
+    assert np.array_equal(
+        np.array([[0.5, 0.5, 0.5], [1, 1, 1], [1, 0, 1], [0.5, 0, 0.5]]),
+        default_bounds.clip_positions(array),
+    )
+
+
+def test_positions_within_bounds_wrong_frame(default_bounds, asset_frame):
+    positions = Positions.from_array(np.array([[0.5, 0.5, 0.5]]), frame=asset_frame)
+    with pytest.raises(ValueError):
+        default_bounds.positions_within_bounds(positions)
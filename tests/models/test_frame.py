@@ -1,7 +1,49 @@
-from alitra import Frame
+import copy
+import pickle
+from dataclasses import asdict, fields
+
+import pytest
+
+from alitra import Frame, Position
 
 
 def test_frame():
     expected_frame = Frame("test")
     frame: Frame = Frame("test")
     assert frame == expected_frame
+
+
+def test_frame_interned():
+    frame = Frame("interned")
+    assert Frame("interned") is frame
+    assert Frame(name="interned") is frame
+    assert Frame.from_id(frame.id) is frame
+    assert Frame("other_interned").id != frame.id
+    assert Frame("interned") != Frame("other_interned")
+
+
+def test_frame_pickle_and_copy_return_interned_frame():
+    frame = Frame("pickled")
+    assert pickle.loads(pickle.dumps(frame)) is frame
+    assert copy.deepcopy(frame) is frame
+    assert copy.copy(frame) is frame
+
+
+def test_frame_hashable():
+    frames = {Frame("robot"): 1, Frame("asset"): 2}
+    assert frames[Frame("asset")] == 2
+
+
+def test_frame_from_unknown_id():
+    with pytest.raises(ValueError):
+        Frame.from_id(-1)
+
+
+def test_frame_id_is_not_a_field():
+    frame = Frame("not_a_field")
+    assert [field.name for field in fields(frame)] == ["name"]
+    assert asdict(Position(x=1, y=2, z=3, frame=frame))["frame"] == {
+        "name": "not_a_field"
+    }
+    assert "id" not in repr(frame)
+    assert isinstance(frame.id, int)
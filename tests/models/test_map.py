@@ -65,3 +65,21 @@ def test_mapalignment():
     map_path = Path("./tests/test_data/test_mapalignment.json")
     map_alignment: MapAlignment = MapAlignment.from_config(map_path)
     assert map_alignment.map_from == expected_map
+
+
+@pytest.mark.parametrize(
+    "config", ["test_map_robot.json", "test_map_bounds.json", "test_map_asset.json"]
+)
+def test_load_map_fast(config):
+    map_path = Path("./tests/test_data").joinpath(config)
+    map: Map = Map.from_config_fast(map_path)
+    assert map == Map.from_config(map_path)
+
+
+def test_mapalignment_fast():
+    map_path = Path("./tests/test_data/test_mapalignment.json")
+    map_alignment: MapAlignment = MapAlignment.from_config_fast(map_path)
+    assert map_alignment == MapAlignment.from_config(map_path)
+    assert (
+        map_alignment.map_to.bounds == MapAlignment.from_config(map_path).map_to.bounds
+    )
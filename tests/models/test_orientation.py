@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from alitra import Orientation
+from alitra import Orientation, Orientations
 
 
 def test_orientation_quat_array(robot_frame):
@@ -24,3 +24,71 @@ def test_orientation_invalid_quat_array(robot_frame):
 def test_orientation_invalid_euler_array(robot_frame):
     with pytest.raises(ValueError):
         Orientation.from_euler_array(np.array([1, 1]), frame=robot_frame)
+
+
+@pytest.mark.parametrize("seq", ["ZYX", "xyz", "ZXZ", "yxy"])
+@pytest.mark.parametrize("degrees", [False, True])
+@pytest.mark.parametrize("wrap_angles", [False, True])
+def test_orientations_euler_matches_orientation(robot_frame, seq, degrees, wrap_angles):
+    quat_array = np.random.default_rng(0).normal(size=(500, 4))
+    quat_array /= np.linalg.norm(quat_array, axis=1, keepdims=True)
+    orientations = Orientations.from_quat_array(quat_array, robot_frame)
+
+    euler = orientations.to_euler_array(
+        degrees=degrees, wrap_angles=wrap_angles, seq=seq
+    )
+    expected = np.array(
+        [
+            orientation.to_euler_array(
+                degrees=degrees, wrap_angles=wrap_angles, seq=seq
+            )
+            for orientation in orientations.to_orientations()
+        ]
+    )
+    assert np.array_equal(euler, expected)
+
+    from_euler = Orientations.from_euler_array(
+        euler, robot_frame, degrees=degrees, seq=seq
+    )
+    expected_quat = np.array(
+        [
+            Orientation.from_euler_array(
+                angles, robot_frame, degrees=degrees, seq=seq
+            ).to_quat_array()
+            for angles in euler
+        ]
+    )
+    assert np.array_equal(from_euler.to_quat_array(), expected_quat)
+
+
+def test_orientations_wrap_angles(robot_frame):
+    euler = np.array([[-np.pi / 2, 0.1, -0.2], [3.0, -1.0, 0.5]])
+    orientations = Orientations.from_euler_array(euler, robot_frame)
+    wrapped = orientations.to_euler_array(wrap_angles=True)
+    assert np.all((wrapped >= 0) & (wrapped < 2 * np.pi))
+    assert np.allclose(np.mod(euler, 2 * np.pi), wrapped)
+
+
+def test_orientations_from_orientations(robot_frame):
+    orientation_list = [
+        Orientation.from_euler_array(np.array([angle, 0, 0]), robot_frame)
+        for angle in [0.1, 0.2, 0.3]
+    ]
+    orientations = Orientations.from_orientations(orientation_list, robot_frame)
+    assert len(orientations) == 3
+    assert orientations[1] == orientation_list[1]
+    assert orientations.to_orientations() == orientation_list
+    assert orientations == Orientations.from_quat_array(
+        orientations.to_quat_array(), robot_frame
+    )
+
+
+def test_orientations_invalid(robot_frame, asset_frame):
+    with pytest.raises(ValueError):
+        Orientations.from_quat_array(np.zeros((2, 3)), robot_frame)
+    with pytest.raises(ValueError):
+        Orientations.from_euler_array(np.zeros(3), robot_frame)
+    with pytest.raises(ValueError):
+        Orientations.from_orientations(
+            [Orientation(x=0, y=0, z=0, w=1, frame=asset_frame)], robot_frame
+        )
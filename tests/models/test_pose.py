@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from alitra import Frame, Pose
+from alitra import Frame, Pose, PoseArray
 
 
 def test_pose_array():
@@ -15,3 +16,32 @@ def test_pose_array():
     assert pose.frame == expected_frame
     assert np.allclose(pos_array, expected_pos_array)
     assert np.allclose(quat_array, expected_quat_array)
+
+
+def test_pose_array_from_poses(robot_frame):
+    poses = [
+        Pose.from_array(np.array([1, 2, 3]), np.array([0, 0, 0, 1]), robot_frame),
+        Pose.from_array(
+            np.array([4, 5, 6]), np.array([0.5, 0.5, 0.5, 0.5]), robot_frame
+        ),
+    ]
+    pose_array: PoseArray = PoseArray.from_poses(poses, frame=robot_frame)
+    pos_array, quat_array = pose_array.to_array()
+    assert pos_array.shape == (2, 3)
+    assert quat_array.shape == (2, 4)
+    assert pose_array.to_poses() == poses
+    assert pose_array[1] == poses[1]
+    assert pose_array.to_orientations() == [pose.orientation for pose in poses]
+    assert (
+        PoseArray.from_orientations(
+            pose_array.to_positions(), pose_array.to_orientations()
+        )
+        == pose_array
+    )
+
+
+def test_pose_array_invalid_shapes(robot_frame):
+    with pytest.raises(ValueError):
+        PoseArray.from_array(np.zeros((2, 3)), np.zeros((3, 4)), robot_frame)
+    with pytest.raises(ValueError):
+        PoseArray.from_array(np.zeros((2, 3)), np.zeros((2, 3)), robot_frame)
@@ -24,3 +24,43 @@ def test_position_list_array(robot_frame):
 def test_positions_invalid_array(robot_frame):
     with pytest.raises(ValueError):
         Positions.from_array(np.array([[1, 1], [1, 1]]), frame=robot_frame)
+
+
+def test_positions_from_array_is_zero_copy(robot_frame):
+    array = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    positions: Positions = Positions.from_array(array, frame=robot_frame)
+    assert positions.to_array() is array
+
+
+def test_positions_list_and_array_agree(robot_frame):
+    position_list = [
+        Position(x=1, y=2, z=3, frame=robot_frame),
+        Position(x=4, y=5, z=6, frame=robot_frame),
+    ]
+    positions: Positions = Positions(positions=position_list, frame=robot_frame)
+    from_array: Positions = Positions.from_array(
+        np.array([[1, 2, 3], [4, 5, 6]]), frame=robot_frame
+    )
+    assert positions.positions is position_list
+    assert positions == from_array
+    assert from_array.positions == position_list
+    assert len(from_array) == 2
+    assert from_array[1] == position_list[1]
+    assert list(from_array) == position_list
+    assert np.allclose(from_array[1:].to_array(), np.array([[4, 5, 6]]))
+
+
+def test_positions_list_changes_reach_array(robot_frame):
+    positions: Positions = Positions.from_array(
+        np.array([[1, 2, 3], [4, 5, 6]]), frame=robot_frame
+    )
+    positions.positions.append(Position(x=7, y=8, z=9, frame=robot_frame))
+    assert len(positions) == 3
+    assert positions.to_array().shape == (3, 3)
+
+    positions.positions[0].x = 10
+    assert positions.to_array()[0, 0] == 10
+    assert positions[0].x == 10
+    assert positions == Positions.from_array(
+        np.array([[10, 2, 3], [4, 5, 6], [7, 8, 9]]), frame=robot_frame
+    )
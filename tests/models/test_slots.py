@@ -0,0 +1,51 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
+import numpy as np
+import pytest
+
+from alitra import Frame, Orientation, Pose, Position, Translation
+
+
+def make_models():
+    frame = Frame("robot")
+    position = Position(x=1, y=2, z=3, frame=frame)
+    orientation = Orientation(x=0, y=0, z=0, w=1, frame=frame)
+    return [
+        frame,
+        position,
+        orientation,
+        Pose(position, orientation, frame),
+        Translation(x=1, y=2, from_=frame, to_=Frame("asset")),
+    ]
+
+
+@pytest.mark.parametrize("model", make_models())
+def test_models_are_slotted(model):
+    assert not hasattr(model, "__dict__")
+    with pytest.raises(AttributeError):
+        model.not_a_field = 1
+
+
+@pytest.mark.parametrize("model", make_models())
+def test_models_pickle(model):
+    assert pickle.loads(pickle.dumps(model)) == model
+
+
+def test_translation_default_z():
+    translation = Translation(x=1, y=2, from_=Frame("robot"), to_=Frame("asset"))
+    assert translation.z == 0
+    assert np.array_equal(translation.to_array(), [1, 2, 0])
+
+
+def test_frame_frozen_and_hashable():
+    frame = Frame("robot")
+    with pytest.raises(FrozenInstanceError):
+        frame.name = "asset"  # type: ignore
+    assert {frame: 1}[Frame("robot")] == 1
+
+
+def test_position_mutable():
+    position = Position(x=1, y=2, z=3, frame=Frame("robot"))
+    position.x = 10
+    assert np.array_equal(position.to_array(), [10, 2, 3])
@@ -1,7 +1,22 @@
+from pathlib import Path
+
 import numpy as np
 import pytest
-
-from alitra import Frame, Position, Positions, Transform, align_maps, align_positions
+from scipy.spatial.transform import Rotation
+
+from alitra import (
+    Frame,
+    Map,
+    MapAlignment,
+    Position,
+    Positions,
+    Transform,
+    align_map_alignments,
+    align_maps,
+    align_positions,
+    align_positions_ransac,
+    try_align_positions,
+)
 
 
 def test_align_positions_translation_only():
@@ -212,3 +227,219 @@ def test_align_positions_outside_rsme_treshold(robot_frame, asset_frame):
         align_positions(
             positions_from=positions_from, positions_to=positions_to, rot_axes="z"
         )
+
+
+def test_align_positions_z_matches_edge_alignment(robot_frame, asset_frame):
+    rng = np.random.default_rng(1)
+    robot_array = rng.uniform(-50, 50, size=(20, 3))
+    expected = Rotation.from_euler("z", 2.5)
+    asset_array = expected.apply(robot_array) + np.array([3, -4, 1])
+    asset_array += rng.normal(scale=0.05, size=asset_array.shape)
+    robot_positions = Positions.from_array(robot_array, frame=robot_frame)
+    asset_positions = Positions.from_array(asset_array, frame=asset_frame)
+
+    transform: Transform = align_positions(
+        positions_from=robot_positions, positions_to=asset_positions, rot_axes="z"
+    )
+    edges_from = (robot_array[:, None] - robot_array[None, :]).reshape(-1, 3)
+    edges_to = (asset_array[:, None] - asset_array[None, :]).reshape(-1, 3)
+    edges_from[:, 2] = edges_to[:, 2] = 0
+    edge_rotation, _ = Rotation.align_vectors(
+        np.vstack([edges_to, [0, 0, 1]]), np.vstack([edges_from, [0, 0, 1]])
+    )
+
+    assert transform.is_planar
+    assert np.allclose(edge_rotation.as_quat(), transform.rotation.as_quat())
+    assert np.allclose(
+        expected.as_euler("ZYX"), transform.rotation.as_euler("ZYX"), atol=1e-2
+    )
+
+
+@pytest.mark.parametrize(
+    "rot_axes, expected_rotation",
+    [
+        ("x", Rotation.from_euler("x", -1.1)),
+        ("y", Rotation.from_euler("y", 0.6)),
+        ("z", Rotation.from_euler("z", 3.0)),
+        ("xyz", Rotation.from_euler("ZYX", [0.4, -0.3, 1.2])),
+    ],
+)
+def test_align_positions_many_positions(
+    robot_frame, asset_frame, rot_axes, expected_rotation
+):
+    rng = np.random.default_rng(2)
+    robot_array = rng.uniform(-500, 500, size=(5000, 3))
+    expected_translation = np.array([10, -20, 5])
+    asset_array = expected_rotation.apply(robot_array) + expected_translation
+
+    transform: Transform = align_positions(
+        positions_from=Positions.from_array(robot_array, frame=robot_frame),
+        positions_to=Positions.from_array(asset_array, frame=asset_frame),
+        rot_axes=rot_axes,
+    )
+
+    assert np.allclose(
+        expected_rotation.as_matrix(), transform.rotation.as_matrix(), atol=1e-8
+    )
+    assert np.allclose(expected_translation, transform.translation.to_array())
+
+
+def test_align_positions_not_unique(robot_frame, asset_frame):
+    positions_from = Positions.from_array(
+        np.array([[1, 0, 0], [1, 0.05, 0], [5, 5, 0]]), frame=robot_frame
+    )
+    positions_to = Positions.from_array(
+        np.array([[1, 0, 0], [2, 0, 0], [5, 5, 0]]), frame=asset_frame
+    )
+    with pytest.raises(ValueError, match="not unique"):
+        align_positions(
+            positions_from=positions_from, positions_to=positions_to, rot_axes="z"
+        )
+
+
+@pytest.mark.parametrize(
+    "rot_axes, n_workers",
+    [("z", None), ("xyz", None), ("xyz", 2)],
+)
+def test_align_positions_ransac_outliers(robot_frame, asset_frame, rot_axes, n_workers):
+    rng = np.random.default_rng(3)
+    robot_array = rng.uniform(-100, 100, size=(300, 3))
+    expected_rotation = Rotation.from_euler("z", 1.3)
+    asset_array = expected_rotation.apply(robot_array) + np.array([4, 2, 0])
+    asset_array += rng.normal(scale=0.02, size=asset_array.shape)
+    outliers = rng.random(300) < 0.3
+    asset_array[outliers] += rng.uniform(5, 50, size=(np.count_nonzero(outliers), 3))
+
+    transform, inliers = align_positions_ransac(
+        positions_from=Positions.from_array(robot_array, frame=robot_frame),
+        positions_to=Positions.from_array(asset_array, frame=asset_frame),
+        rot_axes=rot_axes,
+        n_workers=n_workers,
+        seed=0,
+    )
+
+    assert np.array_equal(inliers, ~outliers)
+    assert np.allclose(
+        expected_rotation.as_matrix(), transform.rotation.as_matrix(), atol=1e-3
+    )
+    assert np.allclose([4, 2, 0], transform.translation.to_array(), atol=1e-2)
+
+
+def test_align_map_alignments(robot_map, robot_frame, asset_frame):
+    here = Path(__file__).parent.resolve()
+    config_path = here.joinpath("./test_data/test_mapalignment.json")
+    missing_path = here.joinpath("./test_data/no_file.json")
+    failing = MapAlignment(
+        name="failing",
+        map_from=robot_map,
+        map_to=Map(
+            name="outside_threshold",
+            frame=asset_frame,
+            reference_positions=Positions.from_array(
+                np.array([[10, 20, 0], [30, 40, 0], [50, 60, 0]]), frame=asset_frame
+            ),
+        ),
+    )
+
+    transforms, errors = align_map_alignments(
+        [config_path, missing_path, failing], rot_axes="z", max_workers=2
+    )
+
+    assert list(transforms) == ["test_mapalignment"]
+    position_to = transforms["test_mapalignment"].transform_position(
+        Position(0, 0, 0, robot_frame), from_=robot_frame, to_=asset_frame
+    )
+    assert np.allclose([80, 10, 0], position_to.to_array())
+    assert set(errors) == {str(missing_path), "failing"}
+    assert isinstance(errors["failing"], ValueError)
+
+
+def test_align_map_alignments_duplicate_names(monkeypatch):
+    from alitra import alignment
+
+    config_path = Path(__file__).parent.joinpath("./test_data/test_mapalignment.json")
+    map_alignment = MapAlignment.from_config(config_path)
+
+    def fail(*args):
+        raise AssertionError("Aligned before the names were checked")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(alignment, "_align_map_alignment", fail)
+        with pytest.raises(ValueError):
+            align_map_alignments(
+                [map_alignment, map_alignment], rot_axes="z", max_workers=1
+            )
+
+    renamed = MapAlignment(
+        name="renamed", map_from=map_alignment.map_from, map_to=map_alignment.map_to
+    )
+    transforms, errors = align_map_alignments(
+        [config_path, map_alignment, renamed], rot_axes="z", max_workers=1
+    )
+    assert list(transforms) == ["renamed"]
+    assert isinstance(errors["test_mapalignment"], ValueError)
+
+
+def test_try_align_positions_residuals_and_sensitivity():
+    robot_frame, asset_frame = Frame("robot"), Frame("asset")
+    array_from = np.random.default_rng(0).uniform(-10, 10, size=(20, 3))
+    rotation = Rotation.from_euler("ZYX", [0.3, -0.2, 0.1])
+    noise = np.random.default_rng(1).normal(scale=0.01, size=(20, 3))
+    array_to = rotation.apply(array_from) + [1, 2, 3] + noise
+
+    result = try_align_positions(
+        Positions.from_array(array_from, frame=robot_frame),
+        Positions.from_array(array_to, frame=asset_frame),
+        rot_axes="xyz",
+    )
+
+    transformed = result.transform.transform_array(array_from, robot_frame, asset_frame)
+    assert result.passed
+    assert np.allclose(result.residuals, transformed - array_to)
+    assert np.allclose(result.errors, np.linalg.norm(transformed - array_to, axis=1))
+    assert result.mean_error == pytest.approx(np.mean(result.errors))
+    assert result.rms_error == pytest.approx(np.sqrt(np.mean(result.errors**2)))
+
+    centred_from = array_from - np.mean(array_from, axis=0)
+    centred_to = array_to - np.mean(array_to, axis=0)
+    _, _, expected_sensitivity = Rotation.align_vectors(
+        centred_to, centred_from, return_sensitivity=True
+    )
+    assert np.allclose(result.sensitivity, expected_sensitivity)
+
+
+def test_try_align_positions_single_axis_sensitivity():
+    robot_frame, asset_frame = Frame("robot"), Frame("asset")
+    array_from = np.array([[0, 0, 0], [2, 0, 0], [0, 2, 0], [2, 2, 1]], dtype=float)
+    array_to = Rotation.from_euler("z", 0.5).apply(array_from)
+
+    result = try_align_positions(
+        Positions.from_array(array_from, frame=robot_frame),
+        Positions.from_array(array_to, frame=asset_frame),
+        rot_axes="z",
+    )
+
+    centred_from = array_from - np.mean(array_from, axis=0)
+    expected = np.zeros((3, 3))
+    expected[2, 2] = 1 / np.sum(centred_from[:, :2] ** 2)
+    assert np.allclose(result.sensitivity, expected)
+    assert result.rms_error == pytest.approx(0, abs=1e-9)
+
+
+def test_try_align_positions_does_not_raise_above_threshold():
+    robot_frame, asset_frame = Frame("robot"), Frame("asset")
+    positions_from = Positions.from_array(
+        np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]), frame=robot_frame
+    )
+    positions_to = Positions.from_array(
+        np.array([[0, 0, 0], [5, 0, 0], [0, 1, 0], [0, 0, 3]]), frame=asset_frame
+    )
+
+    result = try_align_positions(positions_from, positions_to, rot_axes="xyz")
+
+    assert not result.passed
+    assert result.mean_error > result.rsmd_threshold
+    with pytest.raises(
+        ValueError, match=f"Mean distance error {result.mean_error:.4f}"
+    ):
+        align_positions(positions_from, positions_to, rot_axes="xyz")
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from alitra import Positions, transform_file
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_transform_file(tmp_path, transform, robot_frame, asset_frame, dtype):
+    array = np.random.default_rng(9).normal(size=(10001, 3)).astype(dtype)
+    input_path = tmp_path.joinpath("robot.npy")
+    output_path = tmp_path.joinpath("asset.npy")
+    np.save(input_path, array)
+
+    stats = transform_file(
+        transform, input_path, output_path, robot_frame, asset_frame, chunk_size=1000
+    )
+
+    expected = transform.transform_position(
+        Positions.from_array(array, frame=robot_frame), robot_frame, asset_frame
+    )
+    result = np.load(output_path)
+    assert result.dtype == dtype
+    assert np.allclose(expected.to_array(), result, atol=1e-5)
+    assert stats.n_points == 10001 and stats.n_chunks == 11
+    assert stats.points_per_second > 0
+
+
+def test_transform_file_invalid_shape(tmp_path, transform, robot_frame, asset_frame):
+    input_path = tmp_path.joinpath("robot.npy")
+    np.save(input_path, np.zeros((10, 2)))
+    with pytest.raises(ValueError):
+        transform_file(
+            transform,
+            input_path,
+            tmp_path.joinpath("out.npy"),
+            robot_frame,
+            asset_frame,
+        )
+
+
+def test_transform_file_same_input_and_output(
+    tmp_path, transform, robot_frame, asset_frame
+):
+    array = np.random.default_rng(9).normal(size=(10, 3))
+    input_path = tmp_path.joinpath("robot.npy")
+    np.save(input_path, array)
+    with pytest.raises(ValueError):
+        transform_file(
+            transform,
+            input_path,
+            tmp_path.joinpath("other", "..", "robot.npy"),
+            robot_frame,
+            asset_frame,
+        )
+    assert np.array_equal(np.load(input_path), array)
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+import alitra
+
+
+def imported_modules(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import alitra",
+        "from alitra import Frame, Position, Positions, Translation, Bounds",
+        "from alitra import Map, Transform, TransformGraph, load_map",
+    ],
+)
+def test_import_does_not_load_scipy_or_dacite(statement):
+    modules = imported_modules(statement)
+    assert "scipy" not in modules
+    assert "dacite" not in modules
+
+
+def test_lazy_attributes():
+    for name in alitra.__all__:
+        assert getattr(alitra, name) is not None
+    assert set(alitra.__all__) <= set(dir(alitra))
+    with pytest.raises(AttributeError):
+        alitra.not_a_name
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from alitra import IncrementalAligner, Position, Positions, align_positions
+
+
+@pytest.mark.parametrize("rot_axes", ["z", "x", "xyz"])
+def test_incremental_aligner_matches_align_positions(
+    robot_frame, asset_frame, rot_axes
+):
+    rng = np.random.default_rng(4)
+    robot_array = rng.uniform(-100, 100, size=(30, 3)) + 1e5
+    asset_array = Rotation.from_euler("ZYX", [0.5, 0.2, -0.3]).apply(robot_array)
+    asset_array += np.array([3, -4, 1]) + rng.normal(scale=0.05, size=(30, 3))
+    robot_positions = Positions.from_array(robot_array, frame=robot_frame)
+    asset_positions = Positions.from_array(asset_array, frame=asset_frame)
+
+    aligner = IncrementalAligner(robot_frame, asset_frame, rot_axes)
+    for position_from, position_to in zip(robot_positions, asset_positions):
+        aligner.add(position_from, position_to)
+    aligner.add(robot_positions[0], asset_positions[5])
+    aligner.remove(robot_positions[0], asset_positions[5])
+
+    expected = align_positions(
+        robot_positions, asset_positions, rot_axes, rsmd_threshold=np.inf
+    )
+    assert aligner.n_positions == 30
+    assert np.allclose(expected.matrix, aligner.transform.matrix, atol=1e-6)
+
+    transformed = expected.transform_array(robot_array, robot_frame, asset_frame)
+    expected_rms = np.sqrt(np.mean(np.sum((transformed - asset_array) ** 2, axis=1)))
+    assert np.isclose(expected_rms, aligner.rms_error, rtol=1e-4)
+
+
+def test_incremental_aligner_not_enough_positions(robot_frame, asset_frame):
+    aligner = IncrementalAligner(robot_frame, asset_frame, "xyz")
+    aligner.add(Position(0, 0, 0, robot_frame), Position(0, 0, 0, asset_frame))
+    aligner.add(Position(1, 1, 0, robot_frame), Position(1, 1, 0, asset_frame))
+    with pytest.raises(ValueError):
+        aligner.transform
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from alitra import Bounds, Frame, Map, MapRouter, Position, Positions, Transform
+from alitra.models.translation import Translation
+
+
+def make_map(index, lower, upper, robot_frame):
+    deck_frame = Frame(f"deck_{index}")
+    map = Map(
+        name=f"deck_{index}",
+        frame=robot_frame,
+        reference_positions=Positions.from_array(np.zeros((0, 3)), robot_frame),
+        bounds=Bounds(
+            Position(*lower, frame=robot_frame), Position(*upper, frame=robot_frame)
+        ),
+    )
+    transform = Transform.from_euler_array(
+        translation=Translation(x=index, y=0, from_=robot_frame, to_=deck_frame),
+        euler=np.array([0.1 * index, 0, 0]),
+        from_=robot_frame,
+        to_=deck_frame,
+    )
+    return map, transform
+
+
+@pytest.fixture()
+def maps_and_transforms(robot_frame):
+    rng = np.random.default_rng(5)
+    lower = rng.uniform(0, 90, size=(30, 3))
+    upper = lower + rng.uniform(1, 20, size=(30, 3))
+    return [
+        make_map(index, lower[index], upper[index], robot_frame) for index in range(30)
+    ]
+
+
+def test_map_router_route(maps_and_transforms, robot_frame):
+    maps, transforms = zip(*maps_and_transforms)
+    router = MapRouter(list(maps), list(transforms))
+    array = np.random.default_rng(6).uniform(-10, 120, size=(2000, 3))
+
+    expected = np.full(len(array), -1)
+    for point_index, position in enumerate(Positions.from_array(array, robot_frame)):
+        for map_index, map in enumerate(maps):
+            if map.bounds.position_within_bounds(position):
+                expected[point_index] = map_index
+                break
+
+    assert np.array_equal(expected, router.route(array))
+    assert np.any(expected == -1)
+
+
+def test_map_router_transform_positions(maps_and_transforms, robot_frame):
+    maps, transforms = zip(*maps_and_transforms)
+    router = MapRouter(list(maps), list(transforms), cell_size=7)
+    positions = Positions.from_array(
+        np.random.default_rng(7).uniform(0, 100, size=(500, 3)), robot_frame
+    )
+
+    routes = router.route(positions)
+    transformed = router.transform_positions(positions)
+
+    for index, map in enumerate(maps):
+        if not np.any(routes == index):
+            assert map.name not in transformed
+            continue
+        expected = transforms[index].transform_position(
+            Positions.from_array(positions.to_array()[routes == index], robot_frame),
+            robot_frame,
+            transforms[index].to_,
+        )
+        assert transformed[map.name] == expected
+
+
+def test_map_router_requires_bounds(robot_map, default_transform):
+    with pytest.raises(ValueError):
+        MapRouter([robot_map], [default_transform])
+
+
+def test_map_router_requires_unique_names(robot_frame):
+    maps, transforms = zip(
+        make_map(0, [0, 0, -1], [10, 10, 1], robot_frame),
+        make_map(0, [10, 0, -1], [20, 10, 1], robot_frame),
+    )
+    with pytest.raises(ValueError):
+        MapRouter(list(maps), list(transforms))
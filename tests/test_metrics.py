@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from alitra import (
+    Map,
+    MapAlignment,
+    Orientation,
+    PoseArray,
+    Position,
+    Positions,
+    align_positions,
+    metrics,
+)
+
+
+@pytest.fixture()
+def registry():
+    with metrics.collect(metrics.MetricsRegistry()) as registry:
+        yield registry
+
+
+def test_no_measurements_without_sink(default_transform, robot_frame, asset_frame):
+    measurements = []
+    sink = measurements.append
+    with metrics.collect(sink):
+        pass
+    default_transform.transform_position(
+        Position(x=1, y=2, z=3, frame=robot_frame), robot_frame, asset_frame
+    )
+    assert measurements == []
+    assert metrics._sinks == []
+
+
+def test_transform_measurements(registry, default_transform, robot_frame, asset_frame):
+    positions = Positions.from_array(np.ones((10, 3)), frame=robot_frame)
+    default_transform.transform_position(positions, robot_frame, asset_frame)
+    default_transform.transform_position(positions[0], robot_frame, asset_frame)
+    default_transform.transform_orientation(
+        Orientation(x=0, y=0, z=0, w=1, frame=robot_frame), robot_frame, asset_frame
+    )
+    default_transform.transform_poses(
+        PoseArray.from_array(np.ones((5, 3)), np.ones((5, 4)), robot_frame),
+        robot_frame,
+        asset_frame,
+    )
+    # Transforms to the same frame are not measured
+    default_transform.transform_position(positions, robot_frame, robot_frame)
+
+    stats = registry.snapshot()
+    assert stats["transform_position"].calls == 2
+    assert stats["transform_position"].points == 11
+    assert stats["transform_position"].total_seconds > 0
+    assert stats["transform_position"].max_seconds <= (
+        stats["transform_position"].total_seconds
+    )
+    assert stats["transform_orientation"].points == 1
+    assert stats["transform_poses"].points == 5
+
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_align_positions_measurement(
+    registry, default_transform, robot_frame, asset_frame
+):
+    array = np.array([[0, 0, 0], [1, 0, 0], [0, 2, 0], [0, 0, 3]], dtype=float)
+    positions_from = Positions.from_array(array, frame=robot_frame)
+    positions_to = Positions.from_array(
+        default_transform.transform_array(array, robot_frame, asset_frame),
+        frame=asset_frame,
+    )
+    align_positions(positions_from, positions_to, rot_axes="xyz")
+
+    stats = registry.snapshot()["align_positions"]
+    assert stats.calls == 1
+    assert stats.points == 4
+    assert stats.last_rms_error == pytest.approx(0, abs=1e-9)
+
+
+def test_config_loading_measurements(registry):
+    Map.from_config(Path("./tests/test_data/test_map_robot.json"))
+    Map.from_config_fast(Path("./tests/test_data/test_map_robot.json"))
+    map_alignment = MapAlignment.from_config(
+        Path("./tests/test_data/test_mapalignment.json")
+    )
+
+    stats = registry.snapshot()
+    n_positions = len(map_alignment.map_from.reference_positions) + len(
+        map_alignment.map_to.reference_positions
+    )
+    assert stats["map_from_config"].calls == 1
+    assert stats["map_from_config"].points == stats["map_from_config_fast"].points
+    assert stats["map_alignment_from_config"].points == n_positions
+
+
+def test_remove_unknown_sink():
+    with pytest.raises(ValueError):
+        metrics.remove_sink(print)
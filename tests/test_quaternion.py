@@ -0,0 +1,109 @@
+import itertools
+import warnings
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from alitra import _quaternion
+
+SEQUENCES = [
+    "".join(axes)
+    for axes in itertools.product("xyz", repeat=3)
+    if axes[0] != axes[1] and axes[1] != axes[2]
+]
+SEQUENCES += [seq.upper() for seq in SEQUENCES]
+
+
+@pytest.fixture()
+def quats():
+    return np.random.default_rng(0).normal(size=(50, 4))
+
+
+@pytest.mark.parametrize("seq", SEQUENCES)
+def test_to_euler(quats, seq):
+    expected = Rotation.from_quat(quats).as_euler(seq)
+    assert np.allclose(_quaternion.to_euler(quats, seq), expected, atol=1e-12)
+    for quat, euler in zip(quats, expected):
+        assert np.allclose(_quaternion.to_euler(quat, seq), euler, atol=1e-12)
+
+
+@pytest.mark.parametrize("seq", SEQUENCES + ["z", "XY"])
+def test_from_euler(seq):
+    angles = np.random.default_rng(1).uniform(-4, 4, size=(50, len(seq)))
+    expected = Rotation.from_euler(seq, angles).as_quat()
+    assert np.allclose(_quaternion.from_euler(seq, angles), expected, atol=1e-12)
+    assert np.allclose(_quaternion.from_euler(seq, angles[0]), expected[0])
+
+
+def test_euler_degrees(quats):
+    expected = Rotation.from_quat(quats[0]).as_euler("ZYX", degrees=True)
+    assert np.allclose(_quaternion.to_euler(quats[0], "ZYX", degrees=True), expected)
+    assert np.allclose(
+        _quaternion.from_euler("ZYX", expected, degrees=True),
+        Rotation.from_euler("ZYX", expected, degrees=True).as_quat(),
+    )
+
+
+@pytest.mark.parametrize("seq", ["ZYX", "zyx", "ZXZ", "xzx"])
+@pytest.mark.parametrize("second_angle", [0, np.pi / 2, -np.pi / 2, np.pi])
+def test_to_euler_gimbal_lock(seq, second_angle):
+    quat = Rotation.from_euler(seq, [0.3, second_angle, 0.2]).as_quat()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = Rotation.from_quat(quat).as_euler(seq)
+        single = _quaternion.to_euler(quat, seq)
+        batch = _quaternion.to_euler(quat[None], seq)[0]
+    assert np.allclose(single, expected, atol=1e-12)
+    assert np.allclose(batch, expected, atol=1e-12)
+
+
+def test_multiply_and_conjugate(quats):
+    p = Rotation.from_quat(quats[:25])
+    q = Rotation.from_quat(quats[25:])
+    assert np.allclose(
+        _quaternion.multiply(p.as_quat(), q.as_quat()), (p * q).as_quat()
+    )
+    assert np.allclose(
+        _quaternion.multiply(p.as_quat()[0], q.as_quat()[0]), (p[0] * q[0]).as_quat()
+    )
+    assert np.allclose(_quaternion.conjugate(p.as_quat()), p.inv().as_quat())
+
+
+def test_matrix(quats):
+    matrices = Rotation.from_quat(quats).as_matrix()
+    assert np.allclose(_quaternion.to_matrix(quats), matrices)
+    assert np.allclose(_quaternion.to_matrix(quats[0]), matrices[0])
+    assert np.allclose(
+        _quaternion.from_matrix(matrices), Rotation.from_matrix(matrices).as_quat()
+    )
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_apply(quats, inverse):
+    vectors = np.random.default_rng(2).normal(size=(50, 3))
+    rotations = Rotation.from_quat(quats)
+    assert np.allclose(
+        _quaternion.apply(quats, vectors, inverse=inverse),
+        rotations.apply(vectors, inverse=inverse),
+    )
+    assert np.allclose(
+        _quaternion.apply(quats[0], vectors, inverse=inverse),
+        rotations[0].apply(vectors, inverse=inverse),
+    )
+
+
+@pytest.mark.parametrize(
+    "seq, angles",
+    [("ZYX", [1, 2]), ("ZZX", [1, 2, 3]), ("ZyX", [1, 2, 3]), ("ZYXZ", [1, 2, 3, 4])],
+)
+def test_from_euler_invalid(seq, angles):
+    with pytest.raises(ValueError):
+        _quaternion.from_euler(seq, np.array(angles))
+
+
+def test_normalize_zero_norm():
+    with pytest.raises(ValueError):
+        _quaternion.normalize(np.zeros(4))
+    with pytest.raises(ValueError):
+        _quaternion.normalize(np.zeros((2, 4)))
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from alitra import (
+    Frame,
+    Map,
+    MapAlignment,
+    Positions,
+    Transform,
+    Translation,
+    load_map,
+    load_map_alignment,
+    load_transform,
+    save_map,
+    save_map_alignment,
+    save_transform,
+)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load_map(tmp_path, map_with_bounds, robot_map, mmap):
+    for map in [map_with_bounds, robot_map]:
+        path = tmp_path.joinpath(f"{map.name}.npz")
+        save_map(map, path)
+        loaded: Map = load_map(path, mmap=mmap)
+        assert loaded == map
+        assert loaded.bounds == map.bounds
+        assert loaded.frame is map.frame
+        assert loaded.reference_positions.frame is map.reference_positions.frame
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load_map_without_suffix(tmp_path, robot_map, mmap):
+    path = tmp_path.joinpath("mapfile")
+    save_map(robot_map, path)
+    assert path.exists()
+    assert not tmp_path.joinpath("mapfile.npz").exists()
+    assert load_map(str(path), mmap=mmap) == robot_map
+
+
+def test_load_map_mmap_is_memory_mapped(tmp_path, robot_frame):
+    array = np.random.default_rng(8).normal(size=(100000, 3))
+    map = Map(
+        name="large",
+        frame=robot_frame,
+        reference_positions=Positions.from_array(array, frame=robot_frame),
+    )
+    path = tmp_path.joinpath("large.npz")
+    save_map(map, path)
+
+    loaded = load_map(path, mmap=True)
+    loaded_array = loaded.reference_positions.to_array()
+    assert isinstance(loaded_array.base, np.memmap)
+    assert not loaded_array.flags.writeable
+    assert np.array_equal(array, loaded_array)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load_map_alignment(tmp_path, mmap):
+    map_alignment = MapAlignment.from_config(
+        Path("./tests/test_data/test_mapalignment.json")
+    )
+    path = tmp_path.joinpath("map_alignment.npz")
+    save_map_alignment(map_alignment, path)
+    loaded: MapAlignment = load_map_alignment(path, mmap=mmap)
+    assert loaded == map_alignment
+    assert loaded.map_to.bounds == map_alignment.map_to.bounds
+
+
+def test_save_load_transform(tmp_path, robot_frame, asset_frame):
+    transform = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    path = tmp_path.joinpath("transform.npz")
+    save_transform(transform, path)
+    loaded: Transform = load_transform(path)
+    assert loaded.from_ == robot_frame and loaded.to_ == asset_frame
+    assert loaded.translation == transform.translation
+    assert np.allclose(loaded.matrix, transform.matrix)
+
+
+def test_load_wrong_kind(tmp_path, robot_map):
+    path = tmp_path.joinpath("map.npz")
+    save_map(robot_map, path)
+    with pytest.raises(ValueError):
+        load_transform(path)
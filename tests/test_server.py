@@ -0,0 +1,258 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from alitra import (
+    Frame,
+    Position,
+    Positions,
+    TransformClient,
+    TransformGraph,
+    TransformServer,
+)
+
+
+def run(transform, socket_path, client_coroutine):
+    async def main():
+        async with TransformServer(TransformGraph([transform]), socket_path):
+            async with TransformClient(socket_path) as client:
+                return await client_coroutine(client)
+
+    return asyncio.run(main())
+
+
+def test_server_transform_array(transform, robot_frame, asset_frame, tmp_path):
+    array = np.random.default_rng(0).normal(size=(20, 3))
+
+    async def request(client):
+        return (
+            await client.transform_array(array, robot_frame, asset_frame),
+            await client.transform_array(array[0], robot_frame, asset_frame),
+            await client.transform_array(array, asset_frame, robot_frame),
+        )
+
+    forward, single, inverse = run(transform, tmp_path / "alitra.sock", request)
+    expected = transform.transform_array(array, robot_frame, asset_frame)
+    assert np.allclose(forward, expected)
+    assert np.allclose(single, expected[0])
+    assert np.allclose(
+        inverse, transform.transform_array(array, asset_frame, robot_frame)
+    )
+
+
+def test_server_concurrent_requests(transform, robot_frame, asset_frame, tmp_path):
+    arrays = [np.random.default_rng(i).normal(size=(i + 1, 3)) for i in range(100)]
+
+    async def request(client):
+        return await asyncio.gather(
+            *(
+                client.transform_array(array, robot_frame, asset_frame)
+                for array in arrays
+            )
+        )
+
+    results = run(transform, tmp_path / "alitra.sock", request)
+    for array, result in zip(arrays, results):
+        assert np.allclose(
+            result, transform.transform_array(array, robot_frame, asset_frame)
+        )
+
+
+def test_server_transform_position(transform, robot_frame, asset_frame, tmp_path):
+    positions = Positions.from_array(
+        np.array([[1, 2, 3], [4, 5, 6]], dtype=float), robot_frame
+    )
+
+    async def request(client):
+        return (
+            await client.transform_position(positions, robot_frame, asset_frame),
+            await client.transform_position(positions[0], robot_frame, asset_frame),
+        )
+
+    result_positions, result_position = run(
+        transform, tmp_path / "alitra.sock", request
+    )
+    assert result_positions == transform.transform_position(
+        positions, robot_frame, asset_frame
+    )
+    assert isinstance(result_position, Position)
+    assert result_position.frame == asset_frame
+
+
+def test_server_unknown_frame(transform, robot_frame, asset_frame, tmp_path):
+    async def request(client):
+        with pytest.raises(ValueError):
+            await client.transform_array(np.zeros(3), robot_frame, Frame("unknown"))
+        return await client.transform_array(np.zeros(3), robot_frame, asset_frame)
+
+    result = run(transform, tmp_path / "alitra.sock", request)
+    assert np.allclose(
+        result, transform.transform_array(np.zeros(3), robot_frame, asset_frame)
+    )
+
+
+def test_client_close_fails_pending_requests(
+    transform, robot_frame, asset_frame, tmp_path
+):
+    socket_path = tmp_path / "alitra.sock"
+
+    async def main():
+        graph = TransformGraph([transform])
+        async with TransformServer(graph, socket_path, max_batch_delay=0.2):
+            client = TransformClient(socket_path)
+            await client.connect()
+            request = asyncio.ensure_future(
+                client.transform_array(np.zeros(3), robot_frame, asset_frame)
+            )
+            await asyncio.sleep(0.05)
+            await client.close()
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(request, timeout=1)
+
+    asyncio.run(main())
+
+
+def test_server_does_not_create_frames(transform, tmp_path):
+    from alitra import server
+    from alitra.models import frame
+
+    socket_path = tmp_path / "alitra.sock"
+    names = b"robot" + b"never_created"
+
+    async def main():
+        async with TransformServer(TransformGraph([transform]), socket_path):
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            writer.write(
+                server._REQUEST_HEADER.pack(7, 5, len(names) - 5, 1)
+                + names
+                + np.zeros(3).tobytes()
+            )
+            header = await reader.readexactly(server._RESPONSE_HEADER.size)
+            request_id, status, length = server._RESPONSE_HEADER.unpack(header)
+            message = await reader.readexactly(length)
+            writer.close()
+            return request_id, status, message.decode()
+
+    request_id, status, message = asyncio.run(main())
+    assert (request_id, status) == (7, server._STATUS_ERROR)
+    assert "never_created" in message
+    assert "never_created" not in frame._frames
+
+
+def test_server_limits_requests_in_flight(
+    transform, robot_frame, asset_frame, tmp_path, monkeypatch
+):
+    from alitra import server
+
+    monkeypatch.setattr(server, "_MAX_IN_FLIGHT", 2)
+    arrays = [np.full((i + 1, 3), i, dtype=float) for i in range(20)]
+
+    async def request(client):
+        return await asyncio.gather(
+            *(
+                client.transform_array(array, robot_frame, asset_frame)
+                for array in arrays
+            )
+        )
+
+    results = run(transform, tmp_path / "alitra.sock", request)
+    for array, result in zip(arrays, results):
+        assert np.allclose(
+            result, transform.transform_array(array, robot_frame, asset_frame)
+        )
+
+
+def test_server_close_stops_connection_handlers(
+    transform, robot_frame, asset_frame, tmp_path
+):
+    socket_path = tmp_path / "alitra.sock"
+
+    async def main():
+        transform_server = TransformServer(TransformGraph([transform]), socket_path)
+        await transform_server.start()
+        client = TransformClient(socket_path)
+        await client.connect()
+        await client.transform_array(np.zeros(3), robot_frame, asset_frame)
+        handlers = list(transform_server._connections)
+
+        await transform_server.close()
+        await client.close()
+        return handlers, transform_server._connections
+
+    handlers, connections = asyncio.run(main())
+    assert len(handlers) == 1
+    assert all(handler.done() for handler in handlers)
+    assert not connections
+
+
+def test_server_answers_malformed_request(
+    transform, robot_frame, asset_frame, tmp_path
+):
+    from alitra import server
+
+    socket_path = tmp_path / "alitra.sock"
+    names = b"\xff\xfe" + b"asset"
+
+    async def main():
+        graph = TransformGraph([transform])
+        async with TransformServer(graph, socket_path, max_batch_delay=0.2):
+            async with TransformClient(socket_path) as client:
+                healthy = asyncio.ensure_future(
+                    client.transform_array(np.ones(3), robot_frame, asset_frame)
+                )
+                await asyncio.sleep(0.05)
+
+                reader, writer = await asyncio.open_unix_connection(str(socket_path))
+                writer.write(
+                    server._REQUEST_HEADER.pack(3, 2, len(names) - 2, 1)
+                    + names
+                    + np.zeros(3).tobytes()
+                )
+                header = await asyncio.wait_for(
+                    reader.readexactly(server._RESPONSE_HEADER.size), timeout=1
+                )
+                writer.close()
+
+                first = await asyncio.wait_for(healthy, timeout=1)
+                second = await asyncio.wait_for(
+                    client.transform_array(np.ones(3), robot_frame, asset_frame),
+                    timeout=1,
+                )
+                return server._RESPONSE_HEADER.unpack(header), first, second
+
+    (request_id, status, _), first, second = asyncio.run(main())
+    assert (request_id, status) == (3, server._STATUS_ERROR)
+    expected = transform.transform_array(np.ones(3), robot_frame, asset_frame)
+    assert np.allclose(first, expected)
+    assert np.allclose(second, expected)
+
+
+def test_server_close_with_connected_client_logs_nothing(
+    transform, robot_frame, asset_frame, tmp_path, caplog
+):
+    socket_path = tmp_path / "alitra.sock"
+
+    async def main():
+        transform_server = TransformServer(TransformGraph([transform]), socket_path)
+        await transform_server.start()
+        client = TransformClient(socket_path)
+        await client.connect()
+        await client.transform_array(np.zeros(3), robot_frame, asset_frame)
+        await transform_server.close()
+        await client.close()
+
+    asyncio.run(main())
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_server_does_not_remove_other_files(transform, tmp_path):
+    path = tmp_path / "not_a_socket"
+    path.write_text("data")
+
+    async def main():
+        await TransformServer(TransformGraph([transform]), path).start()
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+    assert path.read_text() == "data"
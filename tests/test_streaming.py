@@ -0,0 +1,129 @@
+import threading
+
+import numpy as np
+import pytest
+
+from alitra import Orientation, Pose, Position, stream_transform
+
+
+def make_items(robot_frame):
+    rng = np.random.default_rng(10)
+    items = []
+    for index in range(50):
+        xyz = rng.normal(size=3)
+        if index % 4 == 0:
+            items.append(Position(*xyz, frame=robot_frame))
+        elif index % 4 == 1:
+            items.append(
+                Pose(
+                    Position(*xyz, frame=robot_frame),
+                    Orientation.from_euler_array(rng.normal(size=3), robot_frame),
+                    robot_frame,
+                )
+            )
+        elif index % 4 == 2:
+            items.append(xyz)
+        else:
+            items.append(rng.normal(size=(index, 3)))
+    return items
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_stream_transform(transform, robot_frame, asset_frame, batch_size):
+    items = make_items(robot_frame)
+    results = list(
+        stream_transform(transform, iter(items), robot_frame, asset_frame, batch_size)
+    )
+
+    assert len(results) == len(items)
+    for item, result in zip(items, results):
+        if isinstance(item, Pose):
+            expected = transform.transform_pose(item, robot_frame, asset_frame)
+            assert result.frame == asset_frame
+            assert np.allclose(expected.position.to_array(), result.position.to_array())
+            assert np.allclose(
+                expected.orientation.to_quat_array(),
+                result.orientation.to_quat_array(),
+            )
+        elif isinstance(item, Position):
+            expected = transform.transform_position(item, robot_frame, asset_frame)
+            assert result.frame == asset_frame
+            assert np.allclose(expected.to_array(), result.to_array())
+        else:
+            expected = transform.transform_array(item, robot_frame, asset_frame)
+            assert np.allclose(expected, result)
+
+
+def test_stream_transform_is_lazy(transform, robot_frame, asset_frame):
+    def items():
+        yield Position(0, 0, 0, robot_frame)
+        yield Position(1, 0, 0, robot_frame)
+        raise AssertionError("Read past the first batch")
+
+    results = stream_transform(
+        transform, items(), robot_frame, asset_frame, batch_size=2
+    )
+    assert next(results).frame == asset_frame
+    assert next(results).frame == asset_frame
+
+
+def test_stream_transform_max_latency(transform, robot_frame, asset_frame):
+    def items():
+        yield Position(0, 0, 0, robot_frame)
+        yield Position(1, 0, 0, robot_frame)
+        raise AssertionError("Read past the second item")
+
+    results = stream_transform(
+        transform, items(), robot_frame, asset_frame, batch_size=100, max_latency=0
+    )
+    assert next(results).frame == asset_frame
+    assert next(results).frame == asset_frame
+
+
+def test_stream_transform_wrong_frame(transform, asset_frame, robot_frame):
+    with pytest.raises(ValueError):
+        list(
+            stream_transform(
+                transform, [Position(0, 0, 0, asset_frame)], robot_frame, asset_frame
+            )
+        )
+
+
+def test_stream_transform_same_frame_checks_items(transform, robot_frame, asset_frame):
+    items = [Position(0, 0, 0, robot_frame), Position(0, 0, 0, asset_frame)]
+    with pytest.raises(ValueError):
+        list(stream_transform(transform, items, robot_frame, robot_frame))
+
+
+def test_stream_transform_unsupported_item(transform, robot_frame, asset_frame):
+    with pytest.raises(TypeError):
+        list(stream_transform(transform, [[0, 0, 0]], robot_frame, asset_frame))
+
+
+def test_stream_transform_flushes_idle_stream(transform, robot_frame, asset_frame):
+    released = threading.Event()
+
+    def items():
+        yield Position(0, 0, 0, robot_frame)
+        # The stream is idle until the first result has been yielded
+        assert released.wait(timeout=5)
+        yield Position(1, 0, 0, robot_frame)
+
+    results = stream_transform(
+        transform, items(), robot_frame, asset_frame, batch_size=100, max_latency=0.01
+    )
+    assert next(results).frame == asset_frame
+    released.set()
+    assert [result.frame for result in results] == [asset_frame]
+
+
+def test_stream_transform_max_latency_reraises(transform, robot_frame, asset_frame):
+    def items():
+        yield Position(0, 0, 0, robot_frame)
+        raise KeyError("broken stream")
+
+    results = stream_transform(
+        transform, items(), robot_frame, asset_frame, batch_size=100, max_latency=1
+    )
+    with pytest.raises(KeyError):
+        list(results)
@@ -1,4 +1,5 @@
 import pytest
+from scipy.spatial.transform import Rotation
 
 from alitra import Transform, Translation
 
@@ -20,7 +21,17 @@ def test_transform_without_rotation(robot_frame, asset_frame):
 import numpy as np
 import pytest
 
-from alitra import Frame, Orientation, Pose, Position, Positions, Transform, Translation
+from alitra import (
+    Frame,
+    Orientation,
+    Pose,
+    PoseArray,
+    Position,
+    Positions,
+    Transform,
+    TransformGraph,
+    Translation,
+)
 
 
 @pytest.mark.parametrize(
@@ -216,3 +227,219 @@ def test_transform_pose(
     )
     assert np.allclose(expected_pose.position.to_array(), pose_to.position.to_array())
     assert expected_pose.frame == pose_to.frame
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_transform_poses(robot_frame, asset_frame, inverse):
+    translation = Translation(x=1, y=-2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    from_, to_ = (asset_frame, robot_frame) if inverse else (robot_frame, asset_frame)
+    rng = np.random.default_rng(0)
+    quaternions = rng.normal(size=(10, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1)[:, None]
+    poses = PoseArray.from_array(rng.normal(size=(10, 3)), quaternions, frame=from_)
+
+    poses_to = transform.transform_poses(poses, from_=from_, to_=to_)
+
+    assert poses_to.frame == to_
+    for pose, pose_to in zip(poses.to_poses(), poses_to.to_poses()):
+        expected = transform.transform_pose(pose, from_=from_, to_=to_)
+        assert np.allclose(expected.position.to_array(), pose_to.position.to_array())
+        assert np.allclose(
+            expected.orientation.to_quat_array(), pose_to.orientation.to_quat_array()
+        )
+
+
+def test_transform_inverse(robot_frame, asset_frame):
+    translation = Translation(x=1, y=-2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    p_robot = Positions.from_array(
+        np.array([[1, 2, 3], [-1, -2, -3], [100000, 1, -100000]]), frame=robot_frame
+    )
+    p_asset = transform.transform_position(p_robot, robot_frame, asset_frame)
+
+    inverse = transform.inverse()
+    assert inverse is transform.inverse()
+    assert inverse.inverse() is transform
+    assert inverse.from_ == asset_frame and inverse.to_ == robot_frame
+    assert np.allclose(transform.matrix @ inverse.matrix, np.eye(4))
+    assert np.allclose(
+        inverse.transform_position(p_asset, asset_frame, robot_frame).to_array(),
+        p_robot.to_array(),
+    )
+    assert np.allclose(
+        transform.transform_position(p_asset, asset_frame, robot_frame).to_array(),
+        p_robot.to_array(),
+    )
+
+
+def test_transform_cache_invalidated(default_transform, robot_frame, asset_frame):
+    position = Position(x=1, y=0, z=0, frame=robot_frame)
+    assert np.allclose(
+        default_transform.transform_position(
+            position, robot_frame, asset_frame
+        ).to_array(),
+        [1, 0, 0],
+    )
+    default_transform.translation = Translation(
+        x=0, y=5, z=0, from_=robot_frame, to_=asset_frame
+    )
+    assert np.allclose(
+        default_transform.transform_position(
+            position, robot_frame, asset_frame
+        ).to_array(),
+        [1, 5, 0],
+    )
+
+
+def test_transform_planar_array(robot_frame, asset_frame):
+    translation = Translation(x=1, y=-2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.7, 0, 0]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    array = np.array([[1, 2, 3], [-1, -2, -3], [100000, 1, -100000]], dtype=float)
+
+    assert transform.is_planar
+    result = transform.transform_array(array, robot_frame, asset_frame)
+    planar = transform.transform_array(array[:, :2], robot_frame, asset_frame)
+    assert np.allclose(result[:, :2], planar)
+    assert np.allclose(result[:, 2], array[:, 2] + 3)
+
+
+def test_transform_planar_array_not_planar(robot_frame, asset_frame):
+    translation = Translation(x=1, y=-2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.7, 0.1, 0]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    assert not transform.is_planar
+    with pytest.raises(ValueError):
+        transform.transform_array(np.zeros((2, 2)), robot_frame, asset_frame)
+
+
+@pytest.mark.parametrize("shape", [(4,), (1,), (10, 4), (10, 1), (2, 5, 3), ()])
+def test_transform_array_wrong_shape(
+    default_transform, robot_frame, asset_frame, shape
+):
+    with pytest.raises(ValueError):
+        default_transform.transform_array(np.ones(shape), robot_frame, asset_frame)
+
+
+def test_transform_composed_yaw_is_planar(robot_frame, asset_frame):
+    map_frame = Frame("map")
+    graph = TransformGraph(
+        [
+            Transform.from_euler_array(
+                translation=Translation(
+                    x=1, y=2, z=0, from_=robot_frame, to_=map_frame
+                ),
+                euler=np.array([0.3, 0, 0]),
+                from_=robot_frame,
+                to_=map_frame,
+            ),
+            Transform.from_euler_array(
+                translation=Translation(
+                    x=-4, y=1, z=2, from_=map_frame, to_=asset_frame
+                ),
+                euler=np.array([1.1, 0, 0]),
+                from_=map_frame,
+                to_=asset_frame,
+            ),
+        ]
+    )
+    transform = graph.get_transform(robot_frame, asset_frame)
+    assert transform.is_planar
+    assert transform.inverse().is_planar
+
+    array = np.random.default_rng(0).normal(size=(10, 3))
+    planar = transform.transform_array(array[:, :2], robot_frame, asset_frame)
+    expected = transform.transform_array(array, robot_frame, asset_frame)
+    assert np.allclose(planar, expected[:, :2])
+
+
+@pytest.fixture()
+def four_cores(monkeypatch):
+    from alitra import transform
+
+    monkeypatch.setattr(transform, "_available_cores", lambda: 4)
+    monkeypatch.setattr(transform, "_pool", None)
+
+
+@pytest.mark.parametrize("n_threads", [2, 3, 64, None])
+def test_transform_array_parallel(
+    four_cores, transform, robot_frame, asset_frame, n_threads
+):
+    array = np.random.default_rng(0).normal(size=(300_001, 3))
+    matrix = transform.matrix
+
+    result = transform.transform_array(
+        array, robot_frame, asset_frame, n_threads=n_threads
+    )
+    assert np.allclose(result, array @ matrix[:3, :3].T + matrix[:3, 3])
+
+    out = np.empty_like(array)
+    transform.transform_array(
+        array, asset_frame, robot_frame, out=out, n_threads=n_threads
+    )
+    inverse = transform.inverse_matrix
+    assert np.allclose(out, array @ inverse[:3, :3].T + inverse[:3, 3])
+
+
+def test_transform_array_parallel_shares_one_pool(
+    four_cores, transform, robot_frame, asset_frame
+):
+    from alitra import transform as transform_module
+
+    array = np.ones((200_000, 3))
+    transform.transform_array(array, robot_frame, asset_frame, n_threads=2)
+    pool = transform_module._pool
+    transform.transform_array(array, robot_frame, asset_frame, n_threads=64)
+    assert pool is not None
+    assert transform_module._pool is pool
+    assert pool._max_workers == 4
+
+
+def test_transform_position_parallel(four_cores, transform, robot_frame, asset_frame):
+    positions = Positions.from_array(
+        np.random.default_rng(1).normal(size=(250_000, 3)), robot_frame
+    )
+    result = transform.transform_position(
+        positions, robot_frame, asset_frame, n_threads=4
+    )
+    expected = transform.transform_position(positions, robot_frame, asset_frame)
+    assert result.frame == asset_frame
+    assert np.allclose(result.to_array(), expected.to_array())
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_transform_quat_array(default_transform, robot_frame, asset_frame, inverse):
+    from_, to_ = (asset_frame, robot_frame) if inverse else (robot_frame, asset_frame)
+    quats = np.random.default_rng(3).normal(size=(20, 4))
+
+    result = default_transform.transform_quat_array(quats, from_, to_)
+    expected = default_transform.transform_rotation(
+        Rotation.from_quat(quats), from_, to_
+    ).as_quat()
+    assert np.allclose(result, expected)
+    assert np.allclose(
+        default_transform.transform_quat_array(quats[0], from_, to_), expected[0]
+    )
+    orientation = default_transform.transform_orientation(
+        Orientation.from_quat_array(quats[0], from_), from_, to_
+    )
+    assert np.allclose(orientation.to_quat_array(), expected[0])
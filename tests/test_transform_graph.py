@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from alitra import Frame, Positions, Transform, TransformGraph, Translation
+
+
+@pytest.fixture()
+def map_frame():
+    return Frame("map")
+
+
+@pytest.fixture()
+def deck_frame():
+    return Frame("deck")
+
+
+def make_transform(from_, to_, euler, translation):
+    return Transform.from_euler_array(
+        translation=Translation.from_array(np.array(translation), from_, to_),
+        euler=np.array(euler),
+        from_=from_,
+        to_=to_,
+    )
+
+
+@pytest.fixture()
+def transforms(robot_frame, map_frame, deck_frame, asset_frame):
+    return [
+        make_transform(robot_frame, map_frame, [0.3, 0.1, 0], [1, 2, 0]),
+        make_transform(deck_frame, map_frame, [-1.2, 0, 0.2], [10, 0, 3]),
+        make_transform(deck_frame, asset_frame, [2.0, 0, 0], [0, -5, 1]),
+    ]
+
+
+@pytest.fixture()
+def positions(robot_frame):
+    return Positions.from_array(
+        np.array([[1, 2, 3], [-1, -2, -3], [100, 1, -50]]), frame=robot_frame
+    )
+
+
+def test_transform_graph_multi_hop(
+    transforms, positions, robot_frame, map_frame, deck_frame, asset_frame
+):
+    graph = TransformGraph(transforms)
+    robot_to_map, deck_to_map, deck_to_asset = transforms
+
+    expected = robot_to_map.transform_position(positions, robot_frame, map_frame)
+    expected = deck_to_map.transform_position(expected, map_frame, deck_frame)
+    expected = deck_to_asset.transform_position(expected, deck_frame, asset_frame)
+
+    result = graph.transform_position(positions, robot_frame, asset_frame)
+    assert result.frame == asset_frame
+    assert np.allclose(expected.to_array(), result.to_array())
+
+    back = graph.transform_position(result, asset_frame, robot_frame)
+    assert np.allclose(positions.to_array(), back.to_array())
+
+
+def test_transform_graph_caches_chain(transforms, robot_frame, map_frame, asset_frame):
+    graph = TransformGraph(transforms)
+    transform = graph.get_transform(robot_frame, asset_frame)
+    assert graph.get_transform(robot_frame, asset_frame) is transform
+    assert graph.get_transform(robot_frame, map_frame) is transforms[0]
+
+
+def test_transform_graph_replaced_edge_drops_cache(
+    transforms, positions, robot_frame, map_frame, deck_frame, asset_frame
+):
+    graph = TransformGraph(transforms)
+    cached = graph.get_transform(robot_frame, asset_frame)
+
+    new_edge = make_transform(asset_frame, deck_frame, [0, 0, 0], [0, 0, 0])
+    graph.add_transform(new_edge)
+    transform = graph.get_transform(robot_frame, asset_frame)
+    assert transform is not cached
+
+    expected = transforms[0].transform_position(positions, robot_frame, map_frame)
+    expected = transforms[1].transform_position(expected, map_frame, deck_frame)
+    result = transform.transform_position(positions, robot_frame, asset_frame)
+    assert np.allclose(expected.to_array(), result.to_array())
+
+
+def test_transform_graph_unknown_frames(
+    transforms, positions, robot_frame, map_frame, deck_frame, asset_frame
+):
+    graph = TransformGraph(transforms)
+    graph.remove_transform(deck_frame, map_frame)
+    with pytest.raises(ValueError):
+        graph.transform_position(positions, robot_frame, asset_frame)
+    with pytest.raises(ValueError):
+        graph.transform_position(positions, robot_frame, Frame("unknown"))